@@ -13,7 +13,7 @@ from io_crosscheck.parsers import parse_plc_csv, parse_io_list_xlsx
 from io_crosscheck.classifiers import classify_tag, is_spare
 from io_crosscheck.strategies import MatchingEngine
 from io_crosscheck.reports import generate_xlsx_report, generate_html_report, generate_xlsm_report
-from io_crosscheck.models import Classification, MatchResult
+from io_crosscheck.models import Classification, MatchResult, Source
 from io_crosscheck.l5x_extractor import extract_l5x
 from io_crosscheck.l5x_report import generate_l5x_markdown
 from io_crosscheck.l5x_to_crosscheck import extract_l5x_enrichment, enrich_results
@@ -749,7 +749,7 @@ with tab_crosscheck:
 
                 # Mark baseline sources on results
                 for r in results:
-                    r.sources = ["CSV", "XLSX"]
+                    r.sources = Source.CSV | Source.XLSX
 
                 # L5X enrichment (optional)
                 l5x_enrichment_data = None
@@ -836,7 +836,7 @@ with tab_crosscheck:
 
         # Parse info
         l5x_used = st.session_state.get("l5x_used", False)
-        l5x_confirmed = sum(1 for r in results if "L5X" in r.sources) if l5x_used else 0
+        l5x_confirmed = sum(1 for r in results if Source.L5X in r.sources) if l5x_used else 0
         parse_caption = (
             f"Parsed **{st.session_state['plc_tag_count']}** PLC records and "
             f"**{st.session_state['io_device_count']}** IO devices "
@@ -70,9 +70,13 @@ def is_spare(io_tag: str) -> bool:
 # Inter-controller MSG / consumed-tag detection (for L5X alias targets)
 # ---------------------------------------------------------------------------
 
-_MSG_READ_PATTERN = re.compile(r"^[NBF]\d+_R\[", re.IGNORECASE)
-_MSG_WRITE_PATTERN = re.compile(r"^N\d+_W\[", re.IGNORECASE)
-_MSG_RW_PATTERN = re.compile(r"^F\d+_RW\[", re.IGNORECASE)
+# One pattern for all MSG file addresses; the named group that matched
+# gives the direction (N-file _R/_W, B-file _R, F-file _R/_RW).
+_MSG_PATTERN = re.compile(
+    r"^(?:(?P<WRITE>N\d+_W)|(?P<RW>F\d+_RW)|(?P<READ>[NBF]\d+_R))\[",
+    re.IGNORECASE,
+)
+_MSG_DIRECTIONS = {"READ": "READ", "WRITE": "WRITE", "RW": "READ/WRITE"}
 _CONSUMED_PATTERN = re.compile(
     r"^(?!Rack\d)[\w]+(?:\[\d+\])?\.[\w]", re.IGNORECASE
 )
@@ -87,14 +91,10 @@ def detect_msg_direction(alias_for: str) -> tuple[bool, str]:
     """
     if not alias_for:
         return False, ""
-    target = alias_for.strip()
-    if _MSG_WRITE_PATTERN.match(target):
-        return True, "WRITE"
-    if _MSG_RW_PATTERN.match(target):
-        return True, "READ/WRITE"
-    if _MSG_READ_PATTERN.match(target):
-        return True, "READ"
-    return False, ""
+    m = _MSG_PATTERN.match(alias_for.strip())
+    if m is None:
+        return False, ""
+    return True, _MSG_DIRECTIONS[m.lastgroup]
 
 
 def is_consumed_reference(alias_for: str) -> bool:
@@ -115,7 +115,7 @@ def is_consumed_reference(alias_for: str) -> bool:
     # Exclude anything that looks like a Rack address or MSG address
     if target.upper().startswith("RACK"):
         return False
-    if _MSG_READ_PATTERN.match(target) or _MSG_WRITE_PATTERN.match(target) or _MSG_RW_PATTERN.match(target):
+    if _MSG_PATTERN.match(target):
         return False
     # Exclude ENet device references (IPDEV_*, E300_*, VFD_*)
     if _ENET_PREFIX_PATTERN.match(target):
@@ -429,6 +429,9 @@ def _extract_rung(rung_elem) -> dict[str, Any]:
 # Matches instruction operands inside parentheses, e.g. XIC(Tag), MOV(src,dst)
 _OPERAND_RE = re.compile(r"[A-Z]{2,}[A-Z0-9]*\(([^)]+)\)")
 
+# Pure numeric literal operands (e.g. 0, 1, 3.14) are not tag references.
+_NUMERIC_LITERAL_RE = re.compile(r"^-?\d+(\.\d+)?$")
+
 
 def _extract_rung_references(project: l5x.Project) -> list[str]:
     """Extract all tag/address operands referenced in rung CDATA across all programs.
@@ -466,7 +469,7 @@ def _extract_rung_references(project: l5x.Project) -> list[str]:
                 if not operand:
                     continue
                 # Skip pure numeric literals (e.g. 0, 1, 3.14)
-                if re.match(r"^-?\d+(\.\d+)?$", operand):
+                if _NUMERIC_LITERAL_RE.match(operand):
                     continue
                 refs.add(operand.lower())
 
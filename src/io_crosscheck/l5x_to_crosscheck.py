@@ -12,38 +12,110 @@ What the L5X adds:
 from __future__ import annotations
 
 import re
-from typing import Any
+from collections.abc import Mapping
+from typing import Any, TypedDict
 
 from io_crosscheck.models import (
+    AuditCode,
     Classification,
     MatchResult,
     PLCTag,
     RecordType,
+    Source,
 )
 from io_crosscheck.normalizers import (
     normalize_address,
     normalize_tag,
     strip_suffixes,
-    detect_address_format,
+    is_rack_address,
 )
 from io_crosscheck.classifiers import detect_msg_direction, is_consumed_reference
 
 
+# ---------------------------------------------------------------------------
+# Enrichment structures
+# ---------------------------------------------------------------------------
+
+
+class AliasEntry(TypedDict):
+    """An L5X alias tag as stored in the enrichment indexes."""
+    name: str
+    alias_for: str
+    description: str
+
+
+class MsgTagEntry(AliasEntry):
+    """An alias that targets an inter-controller MSG file."""
+    direction: str
+
+
+class L5XEnrichment(TypedDict):
+    """Lookup structures returned by ``extract_l5x_enrichment``."""
+    alias_by_address: dict[str, list[AliasEntry]]
+    alias_by_name: dict[str, AliasEntry]
+    module_names: set[str]
+    module_addresses: set[str]
+    rung_references: frozenset[str]
+    msg_tags: list[MsgTagEntry]
+    consumed_tags: list[AliasEntry]
+
+
 # ---------------------------------------------------------------------------
 # IO catalog patterns (include list)
 # ---------------------------------------------------------------------------
 
-_IO_CATALOG_PATTERNS: list[re.Pattern[str]] = [
-    re.compile(r"^1756-IB", re.IGNORECASE),       # CLX discrete input
-    re.compile(r"^1756-OB", re.IGNORECASE),       # CLX discrete output
-    re.compile(r"^1756-IF", re.IGNORECASE),       # CLX analog input
-    re.compile(r"^1756-OF", re.IGNORECASE),       # CLX analog output
-    re.compile(r"^RIO-MODULE$", re.IGNORECASE),   # PLC5 scanned IO
-    re.compile(r"^193-ECM", re.IGNORECASE),       # E300 overload relay
-    re.compile(r"^PowerFlex", re.IGNORECASE),     # VFD
-    re.compile(r"^Promass", re.IGNORECASE),       # Flow meter
-    re.compile(r"^ETHERNET-MODULE$", re.IGNORECASE),  # Generic ENet device
-]
+# One alternation so each catalog number is tested in a single match call.
+_IO_CATALOG_RE = re.compile(
+    r"""^(?:
+          1756-IB               # CLX discrete input
+        | 1756-OB               # CLX discrete output
+        | 1756-IF               # CLX analog input
+        | 1756-OF               # CLX analog output
+        | RIO-MODULE$           # PLC5 scanned IO
+        | 193-ECM               # E300 overload relay
+        | PowerFlex             # VFD
+        | Promass               # Flow meter
+        | ETHERNET-MODULE$      # Generic ENet device
+    )""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+# Characters that cannot appear in a tag or address operand.  Splitting an
+# expression operand such as ``Rack0:I.Data[5] * 2`` on these yields the
+# tag references inside it.
+_CDATA_TOKEN_SPLIT_RE = re.compile(r"[^\w:.\[\]]+")
+
+
+# ---------------------------------------------------------------------------
+# Audit-trail messages
+#
+# Passes record (AuditCode, args); the text is only formatted when
+# enrich_results is asked to write the audit trail.
+# ---------------------------------------------------------------------------
+
+_AUDIT_MESSAGES: dict[AuditCode, str] = {
+    AuditCode.TAG_CONFIRMED: "L5X alias '{}' → '{}' confirms tag",
+    AuditCode.DESCRIPTION_SUPPLIED: "L5X supplied description: '{}'",
+    AuditCode.ADDRESS_CONFIRMED: "L5X alias(es) {} confirm address '{}'",
+    AuditCode.HARDWARE_CONFIRMED: "L5X module tree confirms hardware at '{}'",
+    AuditCode.DEVICE_ADDRESS_ALIASED: "L5X alias(es) {} reference device address '{}'",
+    AuditCode.TAG_UPGRADED: "L5X upgraded PLC tag from rack-level '{}' to alias '{}'",
+    AuditCode.CDATA_REFERENCED: (
+        "L5X rung CDATA references address '{}' directly (no alias, used in logic)"
+    ),
+    AuditCode.MAY_BE_UNUSED: (
+        "L5X: No alias found for '{}' and address not referenced in rung CDATA"
+        " — IO point may be unused"
+    ),
+    AuditCode.MODULE_CONFIRMED: "L5X module '{}' confirms IO hardware exists",
+    AuditCode.SPARE_REFERENCED: (
+        "L5X: IO list marks '{}' as spare but address is referenced in rung CDATA"
+        " — point is used in logic"
+    ),
+}
+
+_Note = tuple[AuditCode, tuple[Any, ...]]
 
 
 # ---------------------------------------------------------------------------
@@ -51,22 +123,26 @@ _IO_CATALOG_PATTERNS: list[re.Pattern[str]] = [
 # ---------------------------------------------------------------------------
 
 
-def extract_l5x_enrichment(data: dict[str, Any]) -> dict[str, Any]:
+def extract_l5x_enrichment(data: Mapping[str, Any]) -> L5XEnrichment:
     """Pre-process L5X data into lookup structures for enrichment.
 
-    Returns a dict with:
+    *data* is the read-only output of ``extract_l5x``; any mapping types
+    (e.g. ``MappingProxyType``) and sequences are accepted.
+
+    Returns an ``L5XEnrichment`` dict with:
         alias_by_address: dict  — normalized address → list of alias dicts
         alias_by_name:    dict  — normalized tag name → alias dict
         module_names:     set   — names of all IO-catalog modules
         module_addresses: set   — normalized addresses of all IO modules
-        rung_references:  set   — lowercased operands found in rung CDATA
+        rung_references:  frozenset — lowercased rung CDATA operands, plus
+                                      the tag tokens inside expression operands
         msg_tags:         list  — inter-controller MSG aliases (flagged)
         consumed_tags:    list  — consumed/UDT-reference aliases (flagged)
     """
-    alias_by_address: dict[str, list[dict[str, str]]] = {}
-    alias_by_name: dict[str, dict[str, str]] = {}
-    msg_tags: list[dict[str, str]] = []
-    consumed_tags: list[dict[str, str]] = []
+    alias_by_address: dict[str, list[AliasEntry]] = {}
+    alias_by_name: dict[str, AliasEntry] = {}
+    msg_tags: list[MsgTagEntry] = []
+    consumed_tags: list[AliasEntry] = []
 
     ctrl_tags = data.get("controller_tags", {})
     alias_list = ctrl_tags.get("alias_tags", [])
@@ -101,7 +177,9 @@ def extract_l5x_enrichment(data: dict[str, Any]) -> dict[str, Any]:
 
         # Physical IO alias — index by address and name
         addr_key = normalize_address(alias_for)
-        entry = {"name": name, "alias_for": alias_for, "description": description}
+        entry: AliasEntry = {
+            "name": name, "alias_for": alias_for, "description": description,
+        }
         alias_by_address.setdefault(addr_key, []).append(entry)
         alias_by_name[normalize_tag(name)] = entry
 
@@ -122,9 +200,17 @@ def extract_l5x_enrichment(data: dict[str, Any]) -> dict[str, Any]:
             if addr:
                 module_addresses.add(addr.lower())
 
-    # Build rung reference set from CDATA operands
-    rung_refs_list = data.get("rung_references", [])
-    rung_references: set[str] = set(rung_refs_list)
+    # Build rung reference set from CDATA operands.  Real projects repeat
+    # the same operand across many rungs; keep each one once.  Expression
+    # operands (CPT, CMP, ...) are also split into their tag tokens so an
+    # address used inside arithmetic is still found by a set lookup.
+    rung_tokens: set[str] = set()
+    for ref in data.get("rung_references", ()):
+        ref = ref.lower()
+        rung_tokens.add(ref)
+        rung_tokens.update(_CDATA_TOKEN_SPLIT_RE.split(ref))
+    rung_tokens.discard("")
+    rung_references = frozenset(rung_tokens)
 
     return {
         "alias_by_address": alias_by_address,
@@ -139,165 +225,240 @@ def extract_l5x_enrichment(data: dict[str, Any]) -> dict[str, Any]:
 
 def enrich_results(
     results: list[MatchResult],
-    l5x_enrichment: dict[str, Any],
+    l5x_enrichment: L5XEnrichment,
+    audit: bool = True,
 ) -> list[MatchResult]:
     """Enrich crosscheck results with L5X source confirmation.
 
     Key behaviours:
-      - **Source confirmation:** Adds ``'L5X'`` to ``result.sources`` when
+      - **Source confirmation:** Adds ``Source.L5X`` to ``result.sources`` when
         the L5X independently confirms the match.
       - **Description fill:** Supplies a description from L5X when the CSV
         had none.
+
+    Each check runs as its own pass over *results*; the passes run in a
+    fixed order so every result's audit notes keep the same sequence.
+    Every finding sets an ``AuditCode`` bit on ``result.audit_codes``.  With
+    ``audit=False`` the matching messages are not formatted or written to
+    ``audit_trail``; codes, sources, classifications and tags are updated
+    as usual.
     """
     alias_by_address = l5x_enrichment["alias_by_address"]
-    alias_by_name = l5x_enrichment["alias_by_name"]
-    module_names = l5x_enrichment["module_names"]
-    module_addresses = l5x_enrichment["module_addresses"]
-    rung_references = l5x_enrichment.get("rung_references", set())
-
-    for result in results:
-        l5x_confirmations: list[str] = []
-        alias_found_for_device = False
-
-        # --- Check PLC tag side ---
-        if result.plc_tag:
-            tag = result.plc_tag
-            tag_name_norm = normalize_tag(tag.name)
-
-            # Does the L5X have an alias with this name?
-            if tag_name_norm in alias_by_name:
-                l5x_alias = alias_by_name[tag_name_norm]
+    rung_references = l5x_enrichment.get("rung_references", frozenset())
+
+    notes: list[list[_Note]] = [[] for _ in results]
+    dev_addrs = [_device_address_forms(result) for result in results]
+
+    _confirm_names(results, notes, l5x_enrichment["alias_by_name"])
+    _confirm_addresses(
+        results, notes, dev_addrs, alias_by_address,
+        l5x_enrichment["module_addresses"],
+    )
+    _flag_cdata(results, notes, dev_addrs, alias_by_address, rung_references)
+    _confirm_modules(results, notes, l5x_enrichment["module_names"])
+    _reclassify_spares(results, notes, dev_addrs, alias_by_address, rung_references)
+
+    # Apply confirmations
+    for result, l5x_confirmations in zip(results, notes):
+        if not l5x_confirmations:
+            continue
+        result.sources |= Source.L5X
+        for code, args in l5x_confirmations:
+            result.audit_codes |= code
+            if audit:
+                result.audit_trail.append(_AUDIT_MESSAGES[code].format(*args))
+
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Enrichment passes
+# ---------------------------------------------------------------------------
+
+
+def _device_address_forms(result: MatchResult) -> tuple[str, str, str]:
+    """Return the device PLC address as (raw, lowercased, normalize_address)."""
+    dev_addr = result.io_device.plc_address if result.io_device else ""
+    return dev_addr, dev_addr.lower(), normalize_address(dev_addr)
+
+
+def _confirm_names(
+    results: list[MatchResult],
+    notes: list[list[_Note]],
+    alias_by_name: dict[str, AliasEntry],
+) -> None:
+    """Confirm PLC tags by alias name and fill missing descriptions."""
+    by_name_get = alias_by_name.get
+    for result, l5x_confirmations in zip(results, notes):
+        tag = result.plc_tag
+        if not tag:
+            continue
+
+        # Does the L5X have an alias with this name?
+        l5x_alias = by_name_get(normalize_tag(tag.name))
+        if l5x_alias is None:
+            continue
+        l5x_confirmations.append(
+            (AuditCode.TAG_CONFIRMED, (l5x_alias["name"], l5x_alias["alias_for"]))
+        )
+
+        # If the CSV had no description but L5X does, supplement it
+        if not tag.description and l5x_alias.get("description"):
+            tag.description = l5x_alias["description"]
+            l5x_confirmations.append(
+                (AuditCode.DESCRIPTION_SUPPLIED, (l5x_alias["description"],))
+            )
+
+
+def _confirm_addresses(
+    results: list[MatchResult],
+    notes: list[list[_Note]],
+    dev_addrs: list[tuple[str, str, str]],
+    alias_by_address: dict[str, list[AliasEntry]],
+    module_addresses: set[str],
+) -> None:
+    """Confirm PLC tag and IO device addresses against aliases and modules."""
+    by_addr_get = alias_by_address.get
+    for result, l5x_confirmations, (dev_addr, dev_addr_lower, dev_addr_key) in zip(
+        results, notes, dev_addrs
+    ):
+        # Does the L5X have an alias matching the PLC tag's address?
+        tag = result.plc_tag
+        if tag and tag.specifier:
+            aliases = by_addr_get(normalize_address(tag.specifier))
+            if aliases is not None:
                 l5x_confirmations.append(
-                    f"L5X alias '{l5x_alias['name']}' → '{l5x_alias['alias_for']}' confirms tag"
+                    (AuditCode.ADDRESS_CONFIRMED, ([a["name"] for a in aliases], tag.specifier))
                 )
 
-                # If the CSV had no description but L5X does, supplement it
-                if not tag.description and l5x_alias.get("description"):
-                    tag.description = l5x_alias["description"]
-                    l5x_confirmations.append(
-                        f"L5X supplied description: '{l5x_alias['description']}'"
-                    )
-
-            # Does the L5X have an alias matching this address?
-            if tag.specifier:
-                addr_norm = normalize_address(tag.specifier)
-                if addr_norm in alias_by_address:
-                    aliases = alias_by_address[addr_norm]
-                    alias_names = [a["name"] for a in aliases]
-                    l5x_confirmations.append(
-                        f"L5X alias(es) {alias_names} confirm address '{tag.specifier}'"
-                    )
-
-        # --- Check IO device side ---
-        if result.io_device:
-            dev = result.io_device
-
-            # Does the L5X module tree contain this device's address?
-            if dev.plc_address:
-                addr_norm = dev.plc_address.lower()
-                if addr_norm in module_addresses:
-                    l5x_confirmations.append(
-                        f"L5X module tree confirms hardware at '{dev.plc_address}'"
-                    )
-
-                # Also check alias_by_address for the device's PLC address
-                addr_key = normalize_address(dev.plc_address)
-                if addr_key in alias_by_address:
-                    aliases = alias_by_address[addr_key]
-                    alias_names = [a["name"] for a in aliases]
-                    alias_found_for_device = True
-                    l5x_confirmations.append(
-                        f"L5X alias(es) {alias_names} reference device address '{dev.plc_address}'"
-                    )
-
-                    # If the current PLC tag is just a rack-level base name
-                    # (e.g. "Rack0_Group0_Slot0_IO"), upgrade it to the real
-                    # alias tag name from the L5X so the user sees the actual
-                    # PLC tag instead of the rack structure.
-                    if result.plc_tag and len(aliases) == 1:
-                        alias = aliases[0]
-                        rack_base = result.plc_tag.name.strip().lower()
-                        addr_base = dev.plc_address.split(".")[0].strip().lower()
-                        if rack_base == addr_base:
-                            old_name = result.plc_tag.name
-                            result.plc_tag = PLCTag(
-                                name=alias["name"],
-                                description=alias.get("description", "") or result.plc_tag.description,
-                                record_type=RecordType.TAG,
-                                specifier=alias["alias_for"],
-                            )
-                            l5x_confirmations.append(
-                                f"L5X upgraded PLC tag from rack-level '{old_name}' to alias '{alias['name']}'"
-                            )
-
-                # --- Rung CDATA pass for rack-style addresses with no alias ---
-                # If the device has a rack-style address (CLX or PLC5) but
-                # the L5X has no alias for it, check whether the full
-                # address is referenced directly in rung logic.
-                addr_fmt = detect_address_format(dev.plc_address)
-                is_rack_addr = addr_fmt in ("CLX", "PLC5")
-
-                if (
-                    not alias_found_for_device
-                    and is_rack_addr
-                    and rung_references
-                    and result.classification != Classification.SPARE
-                ):
-                    full_addr_lower = dev.plc_address.lower()
-                    if full_addr_lower in rung_references:
-                        l5x_confirmations.append(
-                            f"L5X rung CDATA references address '{dev.plc_address}' directly (no alias, used in logic)"
-                        )
-                    else:
-                        # IO point has a rack-style address but no L5X alias
-                        # AND is not referenced in any rung logic — flag it
-                        result.classification = Classification.RACK_ONLY
-                        result.conflict_flag = True
-                        l5x_confirmations.append(
-                            f"L5X: No alias found for '{dev.plc_address}' and address not referenced in rung CDATA — IO point may be unused"
-                        )
-
-            # Check if device tag name matches a module name
-            if dev.device_tag and dev.device_tag.lower() in module_names:
+        if not dev_addr:
+            continue
+
+        # Does the L5X module tree contain this device's address?
+        if dev_addr_lower in module_addresses:
+            l5x_confirmations.append((AuditCode.HARDWARE_CONFIRMED, (dev_addr,)))
+
+        # Also check alias_by_address for the device's PLC address
+        aliases = by_addr_get(dev_addr_key)
+        if aliases is None:
+            continue
+        l5x_confirmations.append(
+            (AuditCode.DEVICE_ADDRESS_ALIASED, ([a["name"] for a in aliases], dev_addr))
+        )
+
+        # If the current PLC tag is just a rack-level base name
+        # (e.g. "Rack0_Group0_Slot0_IO"), upgrade it to the real
+        # alias tag name from the L5X so the user sees the actual
+        # PLC tag instead of the rack structure.
+        if result.plc_tag and len(aliases) == 1:
+            alias = aliases[0]
+            rack_base = result.plc_tag.name.strip().lower()
+            addr_base = dev_addr_lower.split(".")[0].strip()
+            if rack_base == addr_base:
+                old_name = result.plc_tag.name
+                result.plc_tag = PLCTag(
+                    name=alias["name"],
+                    description=alias.get("description", "") or result.plc_tag.description,
+                    record_type=RecordType.TAG,
+                    specifier=alias["alias_for"],
+                )
                 l5x_confirmations.append(
-                    f"L5X module '{dev.device_tag}' confirms IO hardware exists"
+                    (AuditCode.TAG_UPGRADED, (old_name, alias["name"]))
                 )
 
-        # --- Spare CDATA check ---
-        # If the IO list labels this point as spare but the address (or an
-        # alias for it) appears in rung CDATA, the point is actually used
-        # in logic and should be flagged as a conflict.
+
+def _flag_cdata(
+    results: list[MatchResult],
+    notes: list[list[_Note]],
+    dev_addrs: list[tuple[str, str, str]],
+    alias_by_address: dict[str, list[AliasEntry]],
+    rung_references: frozenset[str],
+) -> None:
+    """Rung CDATA pass for rack-style device addresses with no alias.
+
+    If the device has a rack-style address (CLX or PLC5) but the L5X has no
+    alias for it, check whether the full address is referenced directly in
+    rung logic; if not, the IO point may be unused.
+
+    Without any rung references (e.g. an L5X with no logic) nothing can be
+    confirmed or flagged, so the pass is skipped.
+    """
+    if not rung_references:
+        return
+    for result, l5x_confirmations, (dev_addr, dev_addr_lower, dev_addr_key) in zip(
+        results, notes, dev_addrs
+    ):
         if (
-            result.classification == Classification.SPARE
-            and result.io_device
-            and result.io_device.plc_address
-            and rung_references
+            not dev_addr
+            or dev_addr_key in alias_by_address
+            or result.classification == Classification.SPARE
         ):
-            addr_lower = result.io_device.plc_address.lower()
-            addr_key = normalize_address(result.io_device.plc_address)
-            # Check if the full address is directly in rung CDATA
-            found_in_cdata = addr_lower in rung_references
-            # Also check if any alias for this address is in rung CDATA
-            if not found_in_cdata and addr_key in alias_by_address:
-                for alias in alias_by_address[addr_key]:
-                    if alias["name"].lower() in rung_references:
-                        found_in_cdata = True
-                        break
-            if found_in_cdata:
-                result.classification = Classification.CONFLICT
-                result.conflict_flag = True
-                l5x_confirmations.append(
-                    f"L5X: IO list marks '{result.io_device.plc_address}' as spare but address is referenced in rung CDATA — point is used in logic"
-                )
+            continue
+        if not is_rack_address(dev_addr):
+            continue
 
-        # Apply confirmations
-        if l5x_confirmations:
-            if "L5X" not in result.sources:
-                result.sources.append("L5X")
-            for note in l5x_confirmations:
-                result.audit_trail.append(note)
+        if dev_addr_lower in rung_references:
+            l5x_confirmations.append((AuditCode.CDATA_REFERENCED, (dev_addr,)))
+        else:
+            # IO point has a rack-style address but no L5X alias
+            # AND is not referenced in any rung logic — flag it
+            result.classification = Classification.RACK_ONLY
+            result.conflict_flag = True
+            l5x_confirmations.append((AuditCode.MAY_BE_UNUSED, (dev_addr,)))
 
-    return results
+
+def _confirm_modules(
+    results: list[MatchResult],
+    notes: list[list[_Note]],
+    module_names: set[str],
+) -> None:
+    """Confirm IO devices whose device tag names an L5X module."""
+    for result, l5x_confirmations in zip(results, notes):
+        dev = result.io_device
+        if dev and dev.device_tag and dev.device_tag.lower() in module_names:
+            l5x_confirmations.append((AuditCode.MODULE_CONFIRMED, (dev.device_tag,)))
+
+
+def _reclassify_spares(
+    results: list[MatchResult],
+    notes: list[list[_Note]],
+    dev_addrs: list[tuple[str, str, str]],
+    alias_by_address: dict[str, list[AliasEntry]],
+    rung_references: frozenset[str],
+) -> None:
+    """Flag spare IO points whose address is used in rung logic.
+
+    If the IO list labels a point as spare but the address (or an alias for
+    it) appears in rung CDATA, the point is actually used in logic and is
+    reported as a conflict.
+    """
+    if not rung_references:
+        return
+    spares = [
+        (result, l5x_confirmations, addr_forms)
+        for result, l5x_confirmations, addr_forms in zip(results, notes, dev_addrs)
+        if result.classification == Classification.SPARE and addr_forms[0]
+    ]
+    if not spares:
+        return
+
+    # Spare addresses referenced directly in rung CDATA, in one intersection
+    referenced = rung_references.intersection(
+        dev_addr_lower for _, _, (_, dev_addr_lower, _) in spares
+    )
+
+    for result, l5x_confirmations, (dev_addr, dev_addr_lower, dev_addr_key) in spares:
+        found_in_cdata = dev_addr_lower in referenced
+        # Also check if any alias for this address is in rung CDATA
+        if not found_in_cdata:
+            found_in_cdata = any(
+                alias["name"].lower() in rung_references
+                for alias in alias_by_address.get(dev_addr_key, ())
+            )
+        if found_in_cdata:
+            result.classification = Classification.CONFLICT
+            result.conflict_flag = True
+            l5x_confirmations.append((AuditCode.SPARE_REFERENCED, (dev_addr,)))
 
 
 # ---------------------------------------------------------------------------
@@ -309,7 +470,7 @@ def _is_io_catalog(catalog: str) -> bool:
     """True if the catalog number matches one of the IO include patterns."""
     if not catalog:
         return False
-    return any(pat.match(catalog) for pat in _IO_CATALOG_PATTERNS)
+    return _IO_CATALOG_RE.match(catalog) is not None
 
 
 def _is_enet_catalog(catalog: str) -> bool:
@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from enum import Enum
+from functools import cached_property
+from enum import Enum, IntFlag
 from typing import Optional
 
 
@@ -45,7 +46,28 @@ class Confidence(Enum):
     SUPPORTING = "Supporting"
 
 
-@dataclass
+class Source(IntFlag):
+    """Input files that contributed to a result."""
+    CSV = 1
+    XLSX = 2
+    L5X = 4
+
+
+class AuditCode(IntFlag):
+    """Machine-readable L5X enrichment findings recorded on a result."""
+    TAG_CONFIRMED = 1
+    DESCRIPTION_SUPPLIED = 2
+    ADDRESS_CONFIRMED = 4
+    HARDWARE_CONFIRMED = 8
+    DEVICE_ADDRESS_ALIASED = 16
+    TAG_UPGRADED = 32
+    CDATA_REFERENCED = 64
+    MAY_BE_UNUSED = 128
+    MODULE_CONFIRMED = 256
+    SPARE_REFERENCED = 512
+
+
+@dataclass(slots=True)
 class PLCTag:
     record_type: RecordType
     name: str
@@ -59,7 +81,22 @@ class PLCTag:
     source_line: int = 0
 
 
-@dataclass
+class ParsedPLC(list[PLCTag]):
+    """The tags parsed from a CSV export, in file order."""
+
+    @cached_property
+    def by_name(self) -> dict[str, PLCTag]:
+        """Tags keyed by name; the first record with a name wins.
+
+        Built on first access, so it does not see tags added afterwards.
+        """
+        index: dict[str, PLCTag] = {}
+        for tag in self:
+            index.setdefault(tag.name, tag)
+        return index
+
+
+@dataclass(slots=True)
 class IODevice:
     panel: str = ""
     rack: str = ""
@@ -78,7 +115,7 @@ class IODevice:
     source_row: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchResult:
     io_device: Optional[IODevice] = None
     plc_tag: Optional[PLCTag] = None
@@ -89,4 +126,10 @@ class MatchResult:
     audit_trail: list[str] = field(default_factory=list)
     reviewer: str = ""
     review_timestamp: str = ""
-    sources: list[str] = field(default_factory=list)
+    sources: Source = Source(0)
+    audit_codes: AuditCode = AuditCode(0)
+
+    @property
+    def source_names(self) -> list[str]:
+        """Names of the contributing sources, e.g. ``["CSV", "XLSX", "L5X"]``."""
+        return [s.name for s in Source if s in self.sources]
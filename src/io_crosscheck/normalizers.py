@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
 # Ordered longest-first so that _Input is checked before _In, etc.
 KNOWN_SUFFIXES = [
@@ -24,11 +25,21 @@ _CLX_SLOT_RACK_BASE_PATTERN = re.compile(
 _PLC5_PATTERN = re.compile(
     r"^Rack\d+_Group\d+_Slot\d+_IO\.", re.IGNORECASE
 )
+# _CLX_PATTERN or _PLC5_PATTERN in one match, built from their sources
+# (minus the leading ``^``); leading whitespace is allowed because
+# detect_address_format strips before matching.
+_RACK_ADDR_RE = re.compile(
+    rf"^\s*(?:{_CLX_PATTERN.pattern[1:]}|{_PLC5_PATTERN.pattern[1:]})",
+    re.IGNORECASE,
+)
 _ENET_PATTERN = re.compile(
     r"^(?:E300|VFD|IPDev|IPDEV)_(.+?)(?::[IOCS].*)?$", re.IGNORECASE
 )
 
 
+# Each IO device's io_tag and device_tag are normalized by several strategies
+# (lookup and match), so the results are memoized.
+@lru_cache(maxsize=16384)
 def normalize_tag(tag: str) -> str:
     """Strip known suffixes and case-fold a tag name."""
     tag = tag.strip()
@@ -70,6 +81,11 @@ def detect_address_format(address: str) -> str:
     return "Unknown"
 
 
+def is_rack_address(address: str) -> bool:
+    """True if *address* is a rack-style (CLX or PLC5) IO address."""
+    return _RACK_ADDR_RE.match(address) is not None
+
+
 def extract_rack_base(address: str) -> str | None:
     """Extract the rack base from a CLX address.
 
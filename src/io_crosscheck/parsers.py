@@ -2,12 +2,22 @@
 from __future__ import annotations
 
 import csv
+import os
 import re
+import sys
+from datetime import date, datetime, time
+from importlib.util import find_spec
 from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Iterable, Iterator, Sequence, TextIO
 
-from io_crosscheck.models import PLCTag, IODevice, RecordType, AddressFormat
+from io_crosscheck.models import (
+    PLCTag, IODevice, RecordType, AddressFormat, ParsedPLC,
+)
 from io_crosscheck.normalizers import detect_address_format
 
+if TYPE_CHECKING:
+    from openpyxl import Workbook
+
 _RECORD_TYPES = {
     "TAG": RecordType.TAG,
     "COMMENT": RecordType.COMMENT,
@@ -23,78 +33,108 @@ def _extract_base_name(name: str) -> str:
     return _BASE_NAME_SUFFIX_RE.sub("", name.strip())
 
 
-def parse_plc_csv(filepath: Path, encoding: str = "latin-1") -> list[PLCTag]:
+def parse_plc_csv(
+    source: Path | str | TextIO, encoding: str = "latin-1",
+) -> ParsedPLC:
     """Parse an RSLogix 5000 CSV tag export file.
 
     Handles TAG, COMMENT, ALIAS, and RCOMMENT record types.
     The RSLogix CSV is non-standard with mixed record types and multi-line descriptions.
+
+    *source* is a path or an already-open text file object; *encoding* only
+    applies when a path is opened.
     """
-    tags: list[PLCTag] = []
-    filepath = Path(filepath)
+    if hasattr(source, "read"):
+        return parse_plc_csv_rows(csv.reader(source))
+    with open(source, "r", encoding=encoding, errors="replace") as f:
+        return parse_plc_csv_rows(csv.reader(f))
 
-    with open(filepath, "r", encoding=encoding, errors="replace") as f:
-        reader = csv.reader(f)
-        header = None
-        for line_num, row in enumerate(reader, start=1):
-            if not row:
-                continue
-            # Detect header row
-            if header is None:
-                if row[0].strip().upper() == "TYPE":
-                    header = [c.strip().upper() for c in row]
-                continue
-
-            record_type_str = row[0].strip().upper()
-            if record_type_str not in _RECORD_TYPES:
-                continue
-
-            record_type = _RECORD_TYPES[record_type_str]
-
-            # Skip RCOMMENT records — they are rung comments, not tag data
-            if record_type == RecordType.RCOMMENT:
-                continue
-
-            # Map columns by header position
-            def col(name: str) -> str:
-                try:
-                    idx = header.index(name)
-                    return row[idx].strip() if idx < len(row) else ""
-                except (ValueError, IndexError):
-                    return ""
-
-            name = col("NAME")
-            tag = PLCTag(
-                record_type=record_type,
-                name=name,
-                base_name=_extract_base_name(name),
-                description=col("DESCRIPTION"),
-                datatype=col("DATATYPE"),
-                scope=col("SCOPE"),
-                specifier=col("SPECIFIER"),
-                source_line=line_num,
-            )
-            tags.append(tag)
+
+def parse_plc_csv_rows(rows: Iterable[Sequence[str]]) -> ParsedPLC:
+    """Parse already-split CSV tag export rows, starting at the top of the file.
+
+    Rows before the ``TYPE`` header are skipped.  Rows are numbered from 1, so
+    ``source_line`` matches the file for single-line records.
+    """
+    tags = ParsedPLC()
+    header = None
+    for line_num, row in enumerate(rows, start=1):
+        if not row:
+            continue
+        # Detect header row
+        if header is None:
+            if row[0].strip().upper() == "TYPE":
+                header = [c.strip().upper() for c in row]
+            continue
+
+        record_type_str = row[0].strip().upper()
+        if record_type_str not in _RECORD_TYPES:
+            continue
+
+        record_type = _RECORD_TYPES[record_type_str]
+
+        # Skip RCOMMENT records — they are rung comments, not tag data
+        if record_type == RecordType.RCOMMENT:
+            continue
+
+        # Map columns by header position
+        def col(name: str) -> str:
+            try:
+                idx = header.index(name)
+                return row[idx].strip() if idx < len(row) else ""
+            except (ValueError, IndexError):
+                return ""
+
+        # Names, datatypes and scopes repeat across thousands of records
+        # (every COMMENT on a rack shares its name); intern them so each
+        # distinct value is stored once.
+        name = sys.intern(col("NAME"))
+        tag = PLCTag(
+            record_type=record_type,
+            name=name,
+            base_name=sys.intern(_extract_base_name(name)),
+            description=col("DESCRIPTION"),
+            datatype=sys.intern(col("DATATYPE")),
+            scope=sys.intern(col("SCOPE")),
+            specifier=col("SPECIFIER"),
+            source_line=line_num,
+        )
+        tags.append(tag)
 
     return tags
 
 
-def parse_io_list_xlsx(filepath: Path, sheet_name: str = "ESCO List") -> list[IODevice]:
+def parse_io_list_xlsx(
+    source: Path | str | IO[bytes] | Workbook,
+    sheet_name: str = "ESCO List",
+    engine: str | None = None,
+) -> list[IODevice]:
     """Parse an IO List XLSX file from the specified sheet.
 
     Reads panel, rack, group, slot, channel, PLC IO address, IO tag,
     device tag, module type, module, and range data.
+
+    *source* is a path, a binary file object holding the XLSX bytes, or an
+    already-open ``openpyxl.Workbook``, which is read as-is.
+
+    *engine* selects the workbook reader: ``"calamine"`` (the optional
+    ``python-calamine`` package), ``"openpyxl"``, or ``None`` to use calamine
+    when it is installed and fall back to openpyxl otherwise.
     """
-    import openpyxl
+    return parse_io_list_rows(_iter_sheet_rows(source, sheet_name, engine))
 
-    filepath = Path(filepath)
-    wb = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
-    ws = wb[sheet_name]
 
+def parse_io_list_rows(rows: Iterable[Sequence[Any]]) -> list[IODevice]:
+    """Parse IO List rows of raw cell values, starting at the top of the sheet.
+
+    The first row with a cell containing "panel" is the header.  Rows are
+    numbered from 1, so ``source_row`` matches the spreadsheet row.
+    """
     devices: list[IODevice] = []
     header: list[str] | None = None
     header_map: dict[str, int] = {}
 
-    for row_num, row in enumerate(ws.iter_rows(values_only=True), start=1):
+    for row_num, row in enumerate(rows, start=1):
         cells = [str(c).strip() if c is not None else "" for c in row]
 
         # Detect header row
@@ -152,10 +192,73 @@ def parse_io_list_xlsx(filepath: Path, sheet_name: str = "ESCO List") -> list[IO
         )
         devices.append(device)
 
-    wb.close()
     return devices
 
 
+def _iter_sheet_rows(
+    source: Path | str | IO[bytes] | Workbook, sheet_name: str, engine: str | None,
+) -> Iterator[tuple[Any, ...]]:
+    """Yield each row of *sheet_name* as a tuple of raw cell values.
+
+    Rows are yielded from the top-left of the sheet so that row numbers
+    match the spreadsheet regardless of engine.
+    """
+    if engine is None:
+        engine = "calamine" if find_spec("python_calamine") else "openpyxl"
+    elif engine not in ("calamine", "openpyxl"):
+        raise ValueError(f"Unknown XLSX engine: {engine!r}")
+
+    is_path = isinstance(source, (str, os.PathLike))
+    if not is_path and not hasattr(source, "read"):
+        # An open openpyxl Workbook: no file to load.
+        yield from source[sheet_name].iter_rows(values_only=True)
+        return
+
+    if engine == "calamine":
+        from python_calamine import CalamineWorkbook, WorksheetNotFound
+
+        if is_path:
+            wb = CalamineWorkbook.from_path(str(source))
+        else:
+            wb = CalamineWorkbook.from_filelike(source)
+        try:
+            sheet = wb.get_sheet_by_name(sheet_name)
+        except WorksheetNotFound:
+            raise KeyError(f"Worksheet {sheet_name} does not exist.") from None
+        for row in sheet.to_python(skip_empty_area=False):
+            yield tuple(_as_openpyxl_value(c) for c in row)
+    else:
+        import openpyxl
+
+        wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+        try:
+            yield from wb[sheet_name].iter_rows(values_only=True)
+        finally:
+            wb.close()
+
+
+# Python writes floats from 1e16 up in exponent form, which openpyxl reads
+# back as float; below that, whole numbers are stored without a decimal
+# point and read back as int.
+_OPENPYXL_INT_LIMIT = 1e16
+
+
+def _as_openpyxl_value(value: Any) -> Any:
+    """Convert a calamine cell value to the value openpyxl reports.
+
+    Calamine returns every number as a float and date-only cells as
+    ``date``; openpyxl returns whole numbers as int and dates as
+    ``datetime``, so '11' must not become '11.0'.
+    """
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) < _OPENPYXL_INT_LIMIT:
+            return int(value)
+        return value
+    if type(value) is date:
+        return datetime.combine(value, time())
+    return value
+
+
 def parse_rack_layouts(filepath: Path, sheet_name: str = "Rack Layouts") -> dict:
     """Parse the Rack Layouts sheet for physical slot-to-device cross-reference."""
     import openpyxl
@@ -1,6 +1,8 @@
 """Matching strategies for the IO Crosscheck rule cascade."""
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
+
 from io_crosscheck.models import (
     PLCTag, IODevice, MatchResult, RecordType, AddressFormat,
     Classification, Confidence, TagCategory,
@@ -15,6 +17,9 @@ class BaseStrategy:
     """Base class for all matching strategies."""
     strategy_id: int = 0
     name: str = ""
+    # Set by strategies that implement index_keys/lookup_keys so that
+    # MatchingEngine can hand them only the PLC tags that could match.
+    indexed: bool = False
 
     def match(self, io_device: IODevice, plc_tags: list[PLCTag]) -> MatchResult | None:
         """Attempt to match an IO device against PLC tags.
@@ -23,11 +28,34 @@ class BaseStrategy:
         """
         raise NotImplementedError
 
+    def index_keys(self, tag: PLCTag) -> tuple[str, ...]:
+        """Return the lookup keys under which *tag* can be matched.
+
+        Every tag that ``match`` could accept for some device must be filed
+        under at least one key that ``lookup_keys`` returns for that device.
+        """
+        return ()
+
+    def lookup_keys(self, io_device: IODevice) -> tuple[str, ...]:
+        """Return the index keys whose tags are candidates for *io_device*."""
+        return ()
+
 
 class DirectCLXAddressMatch(BaseStrategy):
     """Strategy 1: Direct Address Match for ControlLogix rack IO."""
     strategy_id = 1
     name = "Direct CLX Address Match"
+    indexed = True
+
+    def index_keys(self, tag: PLCTag) -> tuple[str, ...]:
+        if tag.record_type != RecordType.COMMENT or not tag.specifier:
+            return ()
+        return (normalize_address(tag.specifier),)
+
+    def lookup_keys(self, io_device: IODevice) -> tuple[str, ...]:
+        if io_device.address_format != AddressFormat.CLX or not io_device.plc_address:
+            return ()
+        return (normalize_address(io_device.plc_address),)
 
     def match(self, io_device: IODevice, plc_tags: list[PLCTag]) -> MatchResult | None:
         if io_device.address_format != AddressFormat.CLX:
@@ -88,6 +116,17 @@ class PLC5RackAddressMatch(BaseStrategy):
     """Strategy 2: PLC5 Rack Address Match."""
     strategy_id = 2
     name = "PLC5 Rack Address Match"
+    indexed = True
+
+    def index_keys(self, tag: PLCTag) -> tuple[str, ...]:
+        if tag.record_type != RecordType.TAG:
+            return ()
+        return (tag.name.strip().lower(),)
+
+    def lookup_keys(self, io_device: IODevice) -> tuple[str, ...]:
+        if io_device.address_format != AddressFormat.PLC5 or not io_device.plc_address:
+            return ()
+        return (_plc5_address_base(io_device.plc_address),)
 
     def match(self, io_device: IODevice, plc_tags: list[PLCTag]) -> MatchResult | None:
         if io_device.address_format != AddressFormat.PLC5:
@@ -95,13 +134,7 @@ class PLC5RackAddressMatch(BaseStrategy):
         if not io_device.plc_address:
             return None
 
-        # Extract the base tag name from the PLC5 address (everything before the dot)
-        addr = io_device.plc_address.strip()
-        dot_pos = addr.find(".")
-        if dot_pos > 0:
-            addr_base = addr[:dot_pos].lower()
-        else:
-            addr_base = addr.lower()
+        addr_base = _plc5_address_base(io_device.plc_address)
 
         for tag in plc_tags:
             if tag.record_type != RecordType.TAG:
@@ -122,10 +155,33 @@ class PLC5RackAddressMatch(BaseStrategy):
         return None
 
 
+def _plc5_address_base(address: str) -> str:
+    """Return the lowercased PLC5 base tag name (everything before the dot)."""
+    addr = address.strip()
+    dot_pos = addr.find(".")
+    if dot_pos > 0:
+        return addr[:dot_pos].lower()
+    return addr.lower()
+
+
 class ENetModuleTagExtraction(BaseStrategy):
     """Strategy 4: EtherNet/IP Module Tag Extraction."""
     strategy_id = 4
     name = "ENet Module Tag Extraction"
+    indexed = True
+
+    def index_keys(self, tag: PLCTag) -> tuple[str, ...]:
+        if tag.record_type != RecordType.TAG:
+            return ()
+        device_id = extract_enet_device(tag.name)
+        return (device_id.lower(),) if device_id else ()
+
+    def lookup_keys(self, io_device: IODevice) -> tuple[str, ...]:
+        return tuple(
+            t.strip().lower()
+            for t in (io_device.device_tag, io_device.io_tag)
+            if t and t.strip()
+        )
 
     def match(self, io_device: IODevice, plc_tags: list[PLCTag]) -> MatchResult | None:
         io_dev_tag = io_device.device_tag.strip() if io_device.device_tag else ""
@@ -163,6 +219,19 @@ class TagNameNormalizationMatch(BaseStrategy):
     """Strategy 5: Tag Name Normalization Match."""
     strategy_id = 5
     name = "Tag Name Normalization Match"
+    indexed = True
+
+    def index_keys(self, tag: PLCTag) -> tuple[str, ...]:
+        return tuple(name for name in _plc_names(tag) if name)
+
+    def lookup_keys(self, io_device: IODevice) -> tuple[str, ...]:
+        return tuple(
+            norm for norm in (
+                normalize_tag(io_device.io_tag) if io_device.io_tag else "",
+                normalize_tag(io_device.device_tag) if io_device.device_tag else "",
+            )
+            if norm
+        )
 
     def match(self, io_device: IODevice, plc_tags: list[PLCTag]) -> MatchResult | None:
         io_tag_norm = normalize_tag(io_device.io_tag) if io_device.io_tag else ""
@@ -179,13 +248,7 @@ class TagNameNormalizationMatch(BaseStrategy):
 
         for tag in plc_tags:
             # Match against PLC TAG base_name or COMMENT description
-            plc_names: list[str] = []
-            if tag.base_name:
-                plc_names.append(normalize_tag(tag.base_name))
-            if tag.description:
-                plc_names.append(tag.description.strip().lower())
-
-            for plc_name in plc_names:
+            for plc_name in _plc_names(tag):
                 if not plc_name:
                     continue
                 # Exact match only — no substring matching
@@ -206,69 +269,161 @@ class TagNameNormalizationMatch(BaseStrategy):
         return None
 
 
+def _plc_names(tag: PLCTag) -> tuple[str, ...]:
+    """Return the normalized base_name and lowercased description of *tag*."""
+    plc_names: list[str] = []
+    if tag.base_name:
+        plc_names.append(normalize_tag(tag.base_name))
+    if tag.description:
+        plc_names.append(tag.description.strip().lower())
+    return tuple(plc_names)
+
+
 class MatchingEngine:
-    """Executes matching strategies in priority order."""
+    """Executes matching strategies in priority order.
+
+    ``run`` is ``prepare`` followed by ``match``.  Callers that classify
+    several IO lists against the same PLC tags can ``prepare`` once and
+    ``match`` many times; ``iter_match`` streams the same results.
+    """
 
     def __init__(self) -> None:
-        self.strategies: list[BaseStrategy] = [
+        self.strategies: tuple[BaseStrategy, ...] = (
             DirectCLXAddressMatch(),
             PLC5RackAddressMatch(),
             ENetModuleTagExtraction(),
             TagNameNormalizationMatch(),
-        ]
+        )
+        self._plc_tags: list[PLCTag] | None = None
+        # One entry per strategy: index key -> positions in _plc_tags
+        # (ascending), or None for strategies that scan every tag.
+        self._indexes: list[dict[str, list[int]] | None] = []
+        self._plc_only_candidates: list[PLCTag] = []
 
     def run(
         self, io_devices: list[IODevice], plc_tags: list[PLCTag]
     ) -> list[MatchResult]:
         """Run the full matching cascade and return classification results."""
-        results: list[MatchResult] = []
+        self.prepare(plc_tags)
+        return self.match(io_devices)
+
+    def prepare(self, plc_tags: list[PLCTag]) -> None:
+        """Build the per-strategy PLC tag indexes used by ``match``."""
+        self._plc_tags = plc_tags
+        self._indexes = []
+        for strategy in self.strategies:
+            if not strategy.indexed:
+                self._indexes.append(None)
+                continue
+            index: dict[str, list[int]] = {}
+            for pos, tag in enumerate(plc_tags):
+                for key in strategy.index_keys(tag):
+                    bucket = index.setdefault(key, [])
+                    if not bucket or bucket[-1] != pos:
+                        bucket.append(pos)
+            self._indexes.append(index)
+
+        self._plc_only_candidates = [
+            tag for tag in plc_tags
+            if is_enet_device_tag(tag) and tag.record_type == RecordType.TAG
+        ]
+
+    def match(self, io_devices: list[IODevice]) -> list[MatchResult]:
+        """Classify *io_devices* against the tags given to ``prepare``."""
+        return list(self.iter_match(io_devices))
+
+    def iter_match(self, io_devices: Iterable[IODevice]) -> Iterator[MatchResult]:
+        """Yield ``match`` results one at a time, in the same order.
+
+        IO device results are yielded as each device is classified; the PLC
+        Only results follow once every device has been seen.  The stream
+        keeps the state of the ``prepare`` call before it, so preparing the
+        engine again does not affect results still being consumed.
+        """
+        if self._plc_tags is None:
+            raise RuntimeError("MatchingEngine.prepare() must be called before match()")
+        return self._iter_match(
+            io_devices,
+            self._plc_tags,
+            tuple(zip(self.strategies, self._indexes)),
+            self._plc_only_candidates,
+        )
+
+    def _iter_match(
+        self,
+        io_devices: Iterable[IODevice],
+        plc_tags: list[PLCTag],
+        cascade: tuple[tuple[BaseStrategy, dict[str, list[int]] | None], ...],
+        plc_only_candidates: list[PLCTag],
+    ) -> Iterator[MatchResult]:
         matched_plc_tags: set[int] = set()  # track by source_line
+        candidates_for = self._candidates
+        evaluated = f"Strategies evaluated: {[s.name for s, _ in cascade]}"
 
         # Phase 1: classify each IO device
         for io_dev in io_devices:
             # Check for spare points first
             if is_spare(io_dev.io_tag):
-                results.append(MatchResult(
+                yield MatchResult(
                     io_device=io_dev,
                     classification=Classification.SPARE,
                     audit_trail=[f"IO tag '{io_dev.io_tag}' identified as spare — excluded from matching"],
-                ))
+                )
                 continue
 
             # Run strategies in cascade order
             matched = False
-            for strategy in self.strategies:
-                result = strategy.match(io_dev, plc_tags)
+            for strategy, index in cascade:
+                candidates = candidates_for(strategy, index, io_dev, plc_tags)
+                if not candidates:
+                    continue
+                result = strategy.match(io_dev, candidates)
                 if result is not None:
-                    results.append(result)
+                    yield result
                     if result.plc_tag and result.plc_tag.source_line:
                         matched_plc_tags.add(result.plc_tag.source_line)
                     matched = True
                     break
 
             if not matched:
-                results.append(MatchResult(
+                yield MatchResult(
                     io_device=io_dev,
                     classification=Classification.IO_LIST_ONLY,
                     audit_trail=[
                         f"No matching strategy found for IO device",
                         f"IO tag: '{io_dev.io_tag}', Device tag: '{io_dev.device_tag}', Address: '{io_dev.plc_address}'",
-                        f"Strategies evaluated: {[s.name for s in self.strategies]}",
+                        evaluated,
                     ],
-                ))
+                )
 
         # Phase 2: identify PLC-only tags (ENet devices with no IO List match)
-        for tag in plc_tags:
+        for tag in plc_only_candidates:
             if tag.source_line in matched_plc_tags:
                 continue
-            if is_enet_device_tag(tag) and tag.record_type == RecordType.TAG:
-                results.append(MatchResult(
-                    plc_tag=tag,
-                    classification=Classification.PLC_ONLY,
-                    audit_trail=[
-                        f"PLC TAG '{tag.name}' has no matching IO List device",
-                        f"Classified as PLC Only (ENet device)",
-                    ],
-                ))
-
-        return results
+            yield MatchResult(
+                plc_tag=tag,
+                classification=Classification.PLC_ONLY,
+                audit_trail=[
+                    f"PLC TAG '{tag.name}' has no matching IO List device",
+                    f"Classified as PLC Only (ENet device)",
+                ],
+            )
+
+    def _candidates(
+        self,
+        strategy: BaseStrategy,
+        index: dict[str, list[int]] | None,
+        io_dev: IODevice,
+        plc_tags: list[PLCTag],
+    ) -> list[PLCTag]:
+        """Return the PLC tags *strategy* could match for *io_dev*, in input order."""
+        if index is None:
+            return plc_tags
+        buckets = [index[key] for key in strategy.lookup_keys(io_dev) if key in index]
+        if not buckets:
+            return []
+        if len(buckets) == 1:
+            positions = buckets[0]
+        else:
+            positions = sorted(set().union(*buckets))
+        return [plc_tags[pos] for pos in positions]
@@ -1,8 +1,15 @@
 """Shared fixtures for IO Crosscheck tests."""
 from __future__ import annotations
 
+import csv
+import io
+import os
+from functools import lru_cache
+from pathlib import Path
+
 import pytest
 
+from io_crosscheck import parsers
 from io_crosscheck.models import (
     PLCTag, IODevice, RecordType, TagCategory, AddressFormat,
 )
@@ -275,3 +282,176 @@ def suffix_io_device() -> IODevice:
         address_format=AddressFormat.CLX,
         source_row=120,
     )
+
+
+# ---------------------------------------------------------------------------
+# Synthetic input files (CSV tag export + IO List XLSX)
+#
+# Written under tmp_path_factory so each pytest-xdist worker gets its own
+# copy; session scope builds them once per worker.
+# ---------------------------------------------------------------------------
+
+def _create_plc_csv(path: Path) -> None:
+    """Create a minimal RSLogix 5000-style CSV tag export."""
+    rows = [
+        ["TYPE", "SCOPE", "NAME", "DESCRIPTION", "DATATYPE", "SPECIFIER", "ATTRIBUTES"],
+        # Rack IO tags
+        ["TAG", "", "Rack0:I", "", "AB:1756_IF8:I:0", "", ""],
+        ["TAG", "", "Rack0:O", "", "AB:1756_OB16E:O:0", "", ""],
+        ["TAG", "", "Rack11:I", "", "AB:1756_IF8:I:0", "", ""],
+        # PLC5-format rack tag
+        ["TAG", "", "Rack0_Group0_Slot0_IO", "", "AB:1771_IFE:I:0", "", ""],
+        # COMMENT records
+        ["COMMENT", "", "Rack0:I", "HLSTL5A", "", "Rack0:I.DATA[5].7", ""],
+        ["COMMENT", "", "Rack0:I", "HLSTL5C", "", "Rack0:I.DATA[5].6", ""],
+        ["COMMENT", "", "Rack0:I", "TSV22", "", "Rack0:I.DATA[0].0", ""],
+        # ENet tags
+        ["TAG", "", "E300_P621:I", "", "AB:E300_OL:I:0", "", ""],
+        ["TAG", "", "E300_P9203:I", "", "AB:E300_OL:I:0", "", ""],
+        ["TAG", "", "VFD_M101:O", "", "AB:PF525:O:0", "", ""],
+        # Program tags
+        ["TAG", "MainProgram", "MyCounter", "", "DINT", "", ""],
+        ["TAG", "MainProgram", "LT6110_Monitor", "", "DINT", "", ""],
+    ]
+    with open(path, "w", newline="", encoding="latin-1") as f:
+        csv.writer(f).writerows(rows)
+
+
+def _synthetic_io_devices() -> list[IODevice]:
+    """The IO devices encoded by ``_io_xlsx_bytes``, as the parser returns them.
+
+    Source rows start at 2 because row 1 of the sheet is the header.
+    """
+    return [
+        # CLX device — Strategy 1 match (case-insensitive address)
+        IODevice(panel="X1", rack="0", slot="5", channel="7",
+                 plc_address="Rack0:I.Data[5].7", io_tag="HLSTL5A", device_tag="HLSTL5A",
+                 module_type="DI", address_format=AddressFormat.CLX, source_row=2),
+        # CLX device — Strategy 1 conflict (address matches, name differs)
+        IODevice(panel="X1", rack="0", slot="5", channel="6",
+                 plc_address="Rack0:I.Data[5].6", io_tag="FT656B_Pulse", device_tag="FT656B",
+                 module_type="DI", address_format=AddressFormat.CLX, source_row=3),
+        # PLC5 device — Strategy 2 match
+        IODevice(panel="X1", rack="0", group="0", slot="0", channel="4",
+                 plc_address="Rack0_Group0_Slot0_IO.READ[4]", io_tag="TSV22_EV", device_tag="TSV22",
+                 module_type="DO", address_format=AddressFormat.PLC5, source_row=4),
+        # CLX device — no COMMENT at this address
+        IODevice(panel="X1", rack="0", slot="6", channel="0",
+                 plc_address="Rack0:I.Data[6].0", io_tag="AS611_AUX", device_tag="AS611",
+                 module_type="DI", address_format=AddressFormat.CLX, source_row=5),
+        # ENet device — Strategy 4 match
+        IODevice(panel="X2", io_tag="P621", device_tag="P621",
+                 address_format=AddressFormat.UNKNOWN, source_row=6),
+        # Spare point
+        IODevice(panel="X1", rack="0", group="0", slot="0", channel="14",
+                 plc_address="Rack0_Group0_Slot0_IO.READ[14]", io_tag="Spare",
+                 module_type="DI", address_format=AddressFormat.PLC5, source_row=7),
+        # Suffix stripping — P611_MC → P611
+        IODevice(panel="X1", rack="0", io_tag="P611_MC", device_tag="P611",
+                 address_format=AddressFormat.UNKNOWN, source_row=8),
+        # Substring safety — LT611 should NOT match LT6110_Monitor
+        IODevice(panel="X1", plc_address="Rack99:I.Data[0].0", io_tag="LT611", device_tag="LT611",
+                 module_type="AI", address_format=AddressFormat.CLX, source_row=9),
+        # IO List Only — no match anywhere
+        IODevice(panel="X3", plc_address="Rack99:I.Data[9].9", io_tag="PHANTOM", device_tag="PHANTOM",
+                 module_type="DI", address_format=AddressFormat.CLX, source_row=10),
+    ]
+
+
+@lru_cache(maxsize=None)
+def _io_xlsx_bytes() -> bytes:
+    """Serialize ``_synthetic_io_devices()`` as an IO List XLSX, once per process."""
+    import openpyxl
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("ESCO List")
+    headers = [
+        "Panel", "Rack", "Group", "Slot", "Channel",
+        "PLC IO Address", "IO Tag", "Device Tag",
+        "Module Type", "Module", "Range Low", "Range High", "Units",
+    ]
+    ws.append(headers)
+    for d in _synthetic_io_devices():
+        ws.append([
+            d.panel, d.rack, d.group, d.slot, d.channel,
+            d.plc_address, d.io_tag, d.device_tag,
+            d.module_type, d.module, d.range_low, d.range_high, d.units,
+        ])
+
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+@pytest.fixture(scope="session")
+def plc_csv(tmp_path_factory) -> Path:
+    """The synthetic PLC CSV, written once per session (per worker under xdist)."""
+    path = tmp_path_factory.mktemp("iox") / "tags.csv"
+    _create_plc_csv(path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def io_xlsx(tmp_path_factory) -> Path:
+    """The synthetic IO List XLSX, written once per session (per worker under xdist)."""
+    path = tmp_path_factory.mktemp("iox") / "io_list.xlsx"
+    path.write_bytes(_io_xlsx_bytes())
+    return path
+
+
+@pytest.fixture(scope="session")
+def xlsx_factory():
+    """Return ``make(rows, sheet_name="ESCO List")`` building an in-memory workbook.
+
+    ``openpyxl.Workbook()`` is the slow part of workbook scaffolding, so one
+    workbook is built per session and each call swaps in a fresh sheet.  The
+    returned workbook is only valid until the next call.
+    """
+    import openpyxl
+    wb = openpyxl.Workbook()
+
+    def make(rows: list[list], sheet_name: str = "ESCO List"):
+        for ws in wb.worksheets:
+            wb.remove(ws)
+        ws = wb.create_sheet(sheet_name)
+        for row in rows:
+            ws.append(row)
+        return wb
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def synthetic_io_devices() -> list[IODevice]:
+    """The IO devices stored in ``io_xlsx``, for tests that skip the XLSX parse."""
+    return _synthetic_io_devices()
+
+
+# ---------------------------------------------------------------------------
+# Workbook I/O guard
+#
+# Unit tests build their inputs in memory.  Only tests marked
+# ``@pytest.mark.io`` may load workbooks from disk or a file object.  The
+# guard sits on the parsers' workbook readers, so it covers every engine
+# (openpyxl and calamine) without importing either library.
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True)
+def _forbid_unmarked_workbook_io(request, monkeypatch):
+    if request.node.get_closest_marker("io") is not None:
+        return
+
+    def refuse(*args, **kwargs):
+        raise RuntimeError(
+            f"{request.node.nodeid} loads a workbook; mark it @pytest.mark.io"
+        )
+
+    real_iter_sheet_rows = parsers._iter_sheet_rows
+
+    def iter_sheet_rows(source, sheet_name, engine):
+        # An open Workbook is already in memory; anything else is a load.
+        if isinstance(source, (str, os.PathLike)) or hasattr(source, "read"):
+            refuse()
+        return real_iter_sheet_rows(source, sheet_name, engine)
+
+    monkeypatch.setattr(parsers, "_iter_sheet_rows", iter_sheet_rows)
+    monkeypatch.setattr(parsers, "parse_rack_layouts", refuse)
@@ -12,6 +12,7 @@ from io_crosscheck.classifiers import (
     is_alias_tag,
     is_program_tag,
     is_spare,
+    detect_msg_direction,
 )
 
 
@@ -211,3 +212,26 @@ class TestClassifyTag:
             specifier="Rack0:I.DATA[5].7",
         )
         assert classify_tag(tag) == TagCategory.BIT_LEVEL_COMMENT
+
+
+# ---------------------------------------------------------------------------
+# detect_msg_direction — inter-controller MSG alias targets
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("alias_for,expected", [
+    ("N166_R[10].0", (True, "READ")),
+    ("b12_r[3]", (True, "READ")),
+    ("F112_R[0]", (True, "READ")),
+    ("N168_W[2]", (True, "WRITE")),
+    ("F112_RW[4]", (True, "READ/WRITE")),
+    ("  N7_W[0]", (True, "WRITE")),
+    # Only N files are written and only F files are read/write
+    ("B3_W[0]", (False, "")),
+    ("F8_W[0]", (False, "")),
+    ("N7_RW[0]", (False, "")),
+    ("Rack0:I.Data[5].7", (False, "")),
+    ("N166_R", (False, "")),
+    ("", (False, "")),
+])
+def test_detect_msg_direction(alias_for, expected):
+    assert detect_msg_direction(alias_for) == expected
@@ -9,19 +9,23 @@ import pytest
 
 from io_crosscheck.models import (
     PLCTag, IODevice, RecordType, TagCategory,
-    AddressFormat, Classification, Confidence,
+    AddressFormat, Classification, Confidence, MatchResult,
 )
 from io_crosscheck.strategies import MatchingEngine
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def engine():
     return MatchingEngine()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def chrl_plc_tags() -> list[PLCTag]:
-    """A representative set of PLC tags mimicking the CHRL Xfer System."""
+    """A representative set of PLC tags mimicking the CHRL Xfer System.
+
+    Module-scoped: ``MatchingEngine.run`` only reads its inputs, so the same
+    tag list is shared by every test in this module.
+    """
     return [
         # Rack IO TAGs
         PLCTag(record_type=RecordType.TAG, name="Rack0:I", base_name="Rack0",
@@ -54,125 +58,131 @@ def chrl_plc_tags() -> list[PLCTag]:
     ]
 
 
-class TestPRDTestVectors:
-    """Each test corresponds to a row in PRD Section 9.2 'Specific Test Vectors'."""
-
-    def test_case_sensitivity(self, engine, chrl_plc_tags):
-        """IO: Rack0:I.Data[5].7 vs PLC: Rack0:I.DATA[5].7 (HLSTL5A) → Both, Strategy 1."""
-        io_devices = [
-            IODevice(
-                panel="X1", rack="0", slot="5", channel="7",
-                plc_address="Rack0:I.Data[5].7",
-                io_tag="HLSTL5A", device_tag="HLSTL5A",
-                module_type="DI", address_format=AddressFormat.CLX, source_row=1,
-            ),
-        ]
-        results = engine.run(io_devices, chrl_plc_tags)
-        matched = [r for r in results if r.io_device and r.io_device.io_tag == "HLSTL5A"]
-        assert len(matched) == 1
-        assert matched[0].classification == Classification.BOTH
-        assert matched[0].strategy_id == 1
-
-    def test_suffix_stripping(self, engine, chrl_plc_tags):
-        """IO: TSV22_EV vs PLC comment: TSV22 → Both, Strategy 5 after stripping _EV."""
-        io_devices = [
-            IODevice(
-                panel="X1", rack="0",
-                plc_address="",
-                io_tag="TSV22_EV", device_tag="TSV22",
-                address_format=AddressFormat.UNKNOWN, source_row=2,
-            ),
-        ]
-        results = engine.run(io_devices, chrl_plc_tags)
-        matched = [r for r in results if r.io_device and r.io_device.io_tag == "TSV22_EV"]
-        assert len(matched) == 1
-        assert matched[0].classification == Classification.BOTH
-        assert matched[0].strategy_id == 5
+# Each vector is (IO device, expected classification, expected strategy id).
+# Source rows are unique so results can be looked up per vector after a
+# single engine run over all devices.
+PRD_VECTORS = [
+    pytest.param(
+        IODevice(
+            panel="X1", rack="0", slot="5", channel="7",
+            plc_address="Rack0:I.Data[5].7",
+            io_tag="HLSTL5A", device_tag="HLSTL5A",
+            module_type="DI", address_format=AddressFormat.CLX, source_row=1,
+        ),
+        Classification.BOTH, 1,
+        id="case_sensitivity",
+    ),
+    pytest.param(
+        IODevice(
+            panel="X1", rack="0",
+            plc_address="",
+            io_tag="TSV22_EV", device_tag="TSV22",
+            address_format=AddressFormat.UNKNOWN, source_row=2,
+        ),
+        Classification.BOTH, 5,
+        id="suffix_stripping",
+    ),
+    pytest.param(
+        IODevice(
+            panel="X1", rack="0", slot="5", channel="6",
+            plc_address="Rack0:I.Data[5].6",
+            io_tag="FT656B_Pulse", device_tag="FT656B",
+            module_type="DI", address_format=AddressFormat.CLX, source_row=3,
+        ),
+        Classification.CONFLICT, 1,
+        id="name_conflict",
+    ),
+    pytest.param(
+        IODevice(
+            io_tag="P621", device_tag="P621",
+            address_format=AddressFormat.UNKNOWN, source_row=4,
+        ),
+        Classification.BOTH, 4,
+        id="enet_extraction",
+    ),
+    pytest.param(
+        IODevice(
+            plc_address="Rack0_Group0_Slot0_IO.READ[14]",
+            io_tag="Spare", device_tag="",
+            address_format=AddressFormat.PLC5, source_row=5,
+        ),
+        Classification.SPARE, 0,
+        id="spare_exclusion",
+    ),
+    pytest.param(
+        IODevice(
+            panel="X1", rack="0", slot="6", channel="0",
+            plc_address="Rack0:I.Data[6].0",
+            io_tag="AS611_AUX", device_tag="AS611",
+            module_type="DI", address_format=AddressFormat.CLX, source_row=6,
+        ),
+        Classification.IO_LIST_ONLY, 0,
+        id="no_comment_falls_through",
+    ),
+    pytest.param(
+        IODevice(
+            plc_address="Rack99:I.Data[0].0",
+            io_tag="LT611", device_tag="LT611",
+            address_format=AddressFormat.CLX, source_row=7,
+        ),
+        Classification.IO_LIST_ONLY, 0,
+        id="substring_safety",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def prepared_engine(chrl_plc_tags) -> MatchingEngine:
+    """An engine whose PLC tag indexes are built once for the whole module."""
+    engine = MatchingEngine()
+    engine.prepare(chrl_plc_tags)
+    return engine
+
+
+@pytest.fixture(scope="module")
+def prd_results(prepared_engine) -> dict[int, MatchResult]:
+    """Match every PRD vector in one pass, keyed by IO source row."""
+    io_devices = [p.values[0] for p in PRD_VECTORS]
+    results = prepared_engine.match(io_devices)
+    return {r.io_device.source_row: r for r in results if r.io_device is not None}
 
-    def test_name_conflict(self, engine, chrl_plc_tags):
-        """IO: FT656B_Pulse @ Rack0:I.Data[5].6 vs PLC: HLSTL5C → Conflict."""
-        io_devices = [
-            IODevice(
-                panel="X1", rack="0", slot="5", channel="6",
-                plc_address="Rack0:I.Data[5].6",
-                io_tag="FT656B_Pulse", device_tag="FT656B",
-                module_type="DI", address_format=AddressFormat.CLX, source_row=3,
-            ),
-        ]
-        results = engine.run(io_devices, chrl_plc_tags)
-        matched = [r for r in results if r.io_device and r.io_device.io_tag == "FT656B_Pulse"]
-        assert len(matched) == 1
-        assert matched[0].classification == Classification.CONFLICT
-        assert matched[0].conflict_flag is True
 
-    def test_enet_extraction(self, engine, chrl_plc_tags):
-        """PLC: E300_P621:I vs IO Device Tag: P621 → Both, Strategy 4."""
-        io_devices = [
-            IODevice(
-                io_tag="P621", device_tag="P621",
-                address_format=AddressFormat.UNKNOWN, source_row=4,
-            ),
-        ]
-        results = engine.run(io_devices, chrl_plc_tags)
-        matched = [r for r in results if r.io_device and r.io_device.device_tag == "P621"]
-        assert len(matched) == 1
-        assert matched[0].classification == Classification.BOTH
-        assert matched[0].strategy_id == 4
-
-    def test_spare_exclusion(self, engine, chrl_plc_tags):
-        """IO Tag = 'Spare' at Rack0_Group0_Slot0_IO.READ[14] → Excluded."""
-        io_devices = [
-            IODevice(
-                plc_address="Rack0_Group0_Slot0_IO.READ[14]",
-                io_tag="Spare", device_tag="",
-                address_format=AddressFormat.PLC5, source_row=5,
-            ),
-        ]
-        results = engine.run(io_devices, chrl_plc_tags)
-        matched = [r for r in results if r.io_device and r.io_device.io_tag == "Spare"]
-        assert len(matched) == 1
-        assert matched[0].classification == Classification.SPARE
-
-    def test_no_comment_falls_through(self, engine, chrl_plc_tags):
-        """IO: AS611_AUX @ Rack0:I.Data[6].0, no COMMENT → IO List Only (no strategy match)."""
-        io_devices = [
-            IODevice(
-                panel="X1", rack="0", slot="6", channel="0",
-                plc_address="Rack0:I.Data[6].0",
-                io_tag="AS611_AUX", device_tag="AS611",
-                module_type="DI", address_format=AddressFormat.CLX, source_row=6,
-            ),
-        ]
-        results = engine.run(io_devices, chrl_plc_tags)
-        matched = [r for r in results if r.io_device and r.io_device.io_tag == "AS611_AUX"]
-        assert len(matched) == 1
-        assert matched[0].classification == Classification.IO_LIST_ONLY
-
-    def test_substring_safety(self, engine, chrl_plc_tags):
-        """IO: LT611 should NOT match PLC program tag LT6110_Monitor → No match."""
-        io_devices = [
-            IODevice(
-                plc_address="Rack99:I.Data[0].0",
-                io_tag="LT611", device_tag="LT611",
-                address_format=AddressFormat.CLX, source_row=7,
-            ),
-        ]
-        results = engine.run(io_devices, chrl_plc_tags)
-        matched = [r for r in results if r.io_device and r.io_device.io_tag == "LT611"]
-        assert len(matched) == 1
-        assert matched[0].classification == Classification.IO_LIST_ONLY
+class TestPRDTestVectors:
+    """Each vector corresponds to a row in PRD Section 9.2 'Specific Test Vectors'.
+
+    Vector rows:
+      - case_sensitivity: Rack0:I.Data[5].7 vs PLC Rack0:I.DATA[5].7 (HLSTL5A) → Both, Strategy 1
+      - suffix_stripping: TSV22_EV vs PLC comment TSV22 → Both, Strategy 5 after stripping _EV
+      - name_conflict: FT656B_Pulse @ Rack0:I.Data[5].6 vs PLC HLSTL5C → Conflict
+      - enet_extraction: PLC E300_P621:I vs IO Device Tag P621 → Both, Strategy 4
+      - spare_exclusion: IO Tag 'Spare' at Rack0_Group0_Slot0_IO.READ[14] → Excluded
+      - no_comment_falls_through: AS611_AUX @ Rack0:I.Data[6].0, no COMMENT → IO List Only
+      - substring_safety: LT611 must NOT match PLC program tag LT6110_Monitor → IO List Only
+    """
+
+    @pytest.mark.parametrize("io_device,expected_cls,expected_sid", PRD_VECTORS)
+    def test_vector(self, prd_results, io_device, expected_cls, expected_sid):
+        result = prd_results[io_device.source_row]
+        assert result.classification == expected_cls
+        assert result.strategy_id == expected_sid
+        assert result.conflict_flag is (expected_cls == Classification.CONFLICT)
+
+    def test_prepared_match_equals_run(self, engine, prepared_engine, chrl_plc_tags):
+        """Re-using prepared indexes must give the same results as a fresh run."""
+        io_devices = [p.values[0] for p in PRD_VECTORS]
+        expected = engine.run(io_devices, chrl_plc_tags)
+        for _ in range(2):
+            actual = prepared_engine.match(io_devices)
+            assert [(r.classification, r.strategy_id, r.plc_tag) for r in actual] == [
+                (r.classification, r.strategy_id, r.plc_tag) for r in expected
+            ]
 
     def test_plc_only_enet(self, engine, chrl_plc_tags):
         """PLC: E300_P9203:I with no IO List entry → PLC Only."""
         io_devices = []  # No IO devices at all
         results = engine.run(io_devices, chrl_plc_tags)
-        plc_only_enet = [
-            r for r in results
-            if r.classification == Classification.PLC_ONLY
-            and r.plc_tag is not None
-            and "P9203" in r.plc_tag.name
-        ]
-        assert len(plc_only_enet) >= 1
+        by_name = {r.plc_tag.name: r for r in results if r.plc_tag is not None}
+        assert by_name["E300_P9203:I"].classification == Classification.PLC_ONLY
 
 
 class TestEndToEndProperties:
@@ -191,8 +201,12 @@ class TestEndToEndProperties:
                      device_tag="PHANTOM", address_format=AddressFormat.CLX, source_row=4),
         ]
         results = engine.run(io_devices, chrl_plc_tags)
-        io_results = [r for r in results if r.io_device is not None]
-        assert len(io_results) == len(io_devices)
+        by_row = {r.io_device.source_row: r for r in results if r.io_device is not None}
+        assert by_row.keys() == {d.source_row for d in io_devices}
+        assert by_row[1].classification == Classification.BOTH
+        assert by_row[2].classification == Classification.IO_LIST_ONLY
+        assert by_row[3].classification == Classification.SPARE
+        assert by_row[4].classification == Classification.IO_LIST_ONLY
 
     def test_no_duplicate_classifications(self, engine, chrl_plc_tags):
         """Each IO device should appear in results exactly once."""
@@ -1,6 +1,8 @@
 """Tests for l5x_to_crosscheck enrichment module."""
 from __future__ import annotations
 
+from types import MappingProxyType
+
 import pytest
 
 from io_crosscheck.l5x_to_crosscheck import (
@@ -9,6 +11,7 @@ from io_crosscheck.l5x_to_crosscheck import (
     _is_io_catalog,
 )
 from io_crosscheck.models import (
+    AuditCode,
     MatchResult,
     PLCTag,
     IODevice,
@@ -16,6 +19,7 @@ from io_crosscheck.models import (
     AddressFormat,
     Classification,
     Confidence,
+    Source,
 )
 
 
@@ -26,29 +30,32 @@ from io_crosscheck.models import (
 def _make_data(alias_tags=None, regular_tags=None, modules=None, rung_references=None):
     return {
         "controller_tags": {
-            "alias_tags": alias_tags or [],
-            "regular_tags": regular_tags or [],
+            "alias_tags": alias_tags or (),
+            "regular_tags": regular_tags or (),
         },
-        "modules": modules or [],
-        "rung_references": rung_references or [],
+        "modules": modules or (),
+        "rung_references": rung_references or (),
     }
 
 
+# The extractor only reads its input, so the per-alias/module/port records
+# are read-only mappings rather than fresh mutable dicts.
+
 def _alias(name, alias_for, description=""):
-    return {"name": name, "alias_for": alias_for, "description": description}
+    return MappingProxyType({"name": name, "alias_for": alias_for, "description": description})
 
 
 def _module(name, catalog, parent="", ports=None):
-    return {
+    return MappingProxyType({
         "name": name,
         "catalog_number": catalog,
         "parent_module": parent,
-        "ports": ports or [],
-    }
+        "ports": ports or (),
+    })
 
 
 def _port(port_type, address=""):
-    return {"type": port_type, "address": address}
+    return MappingProxyType({"type": port_type, "address": address})
 
 
 def _match_result(plc_name="", specifier="", dev_tag="", plc_address="",
@@ -67,7 +74,7 @@ def _match_result(plc_name="", specifier="", dev_tag="", plc_address="",
         plc_tag=plc_tag,
         io_device=io_device,
         classification=classification,
-        sources=["CSV", "XLSX"],
+        sources=Source.CSV | Source.XLSX,
     )
 
 
@@ -216,59 +223,49 @@ class TestModuleLookupSets:
 
 
 # ===========================================================================
-# IO catalog filter
+# extract_l5x_enrichment — rung references
 # ===========================================================================
 
-class TestModuleFilterIncludesIO:
-    def test_1756_ib16(self):
-        assert _is_io_catalog("1756-IB16") is True
-
-    def test_1756_ob16e(self):
-        assert _is_io_catalog("1756-OB16E") is True
-
-    def test_1756_if8h(self):
-        assert _is_io_catalog("1756-IF8H/A") is True
-
-    def test_1756_of8i(self):
-        assert _is_io_catalog("1756-OF8I/A") is True
-
-    def test_rio_module(self):
-        assert _is_io_catalog("RIO-MODULE") is True
-
-    def test_193_ecm(self):
-        assert _is_io_catalog("193-ECM-ETR/A") is True
-
-    def test_powerflex(self):
-        assert _is_io_catalog("PowerFlex 755-EENET") is True
-
-    def test_promass(self):
-        assert _is_io_catalog("Promass_83/A") is True
-
-    def test_ethernet_module(self):
-        assert _is_io_catalog("ETHERNET-MODULE") is True
-
-
-class TestModuleFilterExcludesInfra:
-    def test_1756_en2t(self):
-        assert _is_io_catalog("1756-EN2T") is False
+class TestExtractEnrichmentRungReferences:
+    """Rung references are stored once each, lowercased."""
 
-    def test_1756_enbt(self):
-        assert _is_io_catalog("1756-ENBT/A") is False
-
-    def test_1756_dhrio(self):
-        assert _is_io_catalog("1756-DHRIO/D") is False
+    def test_rung_references_deduplicated_and_lowercased(self):
+        data = _make_data(
+            rung_references=["Rack26:12:O.Data.8", "rack26:12:o.data.8", "some_other_tag"],
+        )
+        enrichment = extract_l5x_enrichment(data)
 
-    def test_1756_l84e(self):
-        assert _is_io_catalog("1756-L84E") is False
+        assert enrichment["rung_references"] == frozenset(
+            {"rack26:12:o.data.8", "some_other_tag"}
+        )
 
-    def test_1771_asb(self):
-        assert _is_io_catalog("1771-ASB") is False
 
-    def test_dpi_peripheral(self):
-        assert _is_io_catalog("DPI-DRIVE-PERIPHERAL-MODULE") is False
+# ===========================================================================
+# IO catalog filter
+# ===========================================================================
 
-    def test_empty(self):
-        assert _is_io_catalog("") is False
+@pytest.mark.parametrize("catalog,expected", [
+    # IO modules and ENet devices — included
+    ("1756-IB16", True),
+    ("1756-OB16E", True),
+    ("1756-IF8H/A", True),
+    ("1756-OF8I/A", True),
+    ("RIO-MODULE", True),
+    ("193-ECM-ETR/A", True),
+    ("PowerFlex 755-EENET", True),
+    ("Promass_83/A", True),
+    ("ETHERNET-MODULE", True),
+    # Infrastructure — excluded
+    ("1756-EN2T", False),
+    ("1756-ENBT/A", False),
+    ("1756-DHRIO/D", False),
+    ("1756-L84E", False),
+    ("1771-ASB", False),
+    ("DPI-DRIVE-PERIPHERAL-MODULE", False),
+    ("", False),
+])
+def test_is_io_catalog(catalog, expected):
+    assert _is_io_catalog(catalog) is expected
 
 
 # ===========================================================================
@@ -287,8 +284,12 @@ class TestEnrichResultsTagConfirmation:
         result = _match_result(plc_name="AN601_EV", specifier="Rack14:O.Data[3].2")
         enrich_results([result], enrichment)
 
-        assert "L5X" in result.sources
-        assert any("confirms tag" in s for s in result.audit_trail)
+        assert Source.L5X in result.sources
+        assert result.source_names == ["CSV", "XLSX", "L5X"]
+        assert AuditCode.TAG_CONFIRMED in result.audit_codes
+        assert result.audit_trail[0] == (
+            "L5X alias 'AN601_EV' → 'Rack14:O.Data[3].2' confirms tag"
+        )
 
     def test_tag_not_in_l5x_no_confirmation(self):
         data = _make_data(alias_tags=[])
@@ -297,7 +298,8 @@ class TestEnrichResultsTagConfirmation:
         result = _match_result(plc_name="UNKNOWN_TAG", specifier="Rack99:I.Data[0].0")
         enrich_results([result], enrichment)
 
-        assert "L5X" not in result.sources
+        assert Source.L5X not in result.sources
+        assert not result.audit_codes
 
 
 class TestEnrichResultsAddressConfirmation:
@@ -312,8 +314,8 @@ class TestEnrichResultsAddressConfirmation:
         result = _match_result(plc_name="SomeOtherTag", specifier="Rack14:O.Data[3].2")
         enrich_results([result], enrichment)
 
-        assert "L5X" in result.sources
-        assert any("confirm address" in s for s in result.audit_trail)
+        assert Source.L5X in result.sources
+        assert AuditCode.ADDRESS_CONFIRMED in result.audit_codes
 
 
 class TestEnrichResultsModuleConfirmation:
@@ -329,8 +331,8 @@ class TestEnrichResultsModuleConfirmation:
         result = _match_result(dev_tag="E300_P621", plc_address="192.168.12.150")
         enrich_results([result], enrichment)
 
-        assert "L5X" in result.sources
-        assert any("confirms IO hardware" in s for s in result.audit_trail)
+        assert Source.L5X in result.sources
+        assert AuditCode.MODULE_CONFIRMED in result.audit_codes
 
     def test_module_address_confirmed(self):
         data = _make_data(modules=[
@@ -341,8 +343,8 @@ class TestEnrichResultsModuleConfirmation:
         result = _match_result(dev_tag="SomeDev", plc_address="6")
         enrich_results([result], enrichment)
 
-        assert "L5X" in result.sources
-        assert any("confirms hardware" in s for s in result.audit_trail)
+        assert Source.L5X in result.sources
+        assert AuditCode.HARDWARE_CONFIRMED in result.audit_codes
 
 
 class TestEnrichResultsDescriptionSupplemented:
@@ -359,7 +361,7 @@ class TestEnrichResultsDescriptionSupplemented:
         enrich_results([result], enrichment)
 
         assert result.plc_tag.description == "Tank 601 Valve from L5X"
-        assert any("supplied description" in s for s in result.audit_trail)
+        assert AuditCode.DESCRIPTION_SUPPLIED in result.audit_codes
 
     def test_description_not_overwritten(self):
         data = _make_data(alias_tags=[
@@ -405,7 +407,29 @@ class TestFullEnrichmentPipeline:
         # Enrich a matching result
         result = _match_result(plc_name="AN601_EV", specifier="Rack14:O.Data[3].2")
         enrich_results([result], enrichment)
-        assert "L5X" in result.sources
+        assert Source.L5X in result.sources
+
+    def test_audit_disabled_still_enriches(self):
+        """audit=False skips the audit trail but not sources or reclassification."""
+        data = _make_data(
+            alias_tags=[_alias("AN601_EV", "Rack14:O.Data[3].2", "Tank 601 Valve")],
+            rung_references=["some_other_tag"],
+        )
+        enrichment = extract_l5x_enrichment(data)
+
+        confirmed = _match_result(plc_name="AN601_EV", specifier="Rack14:O.Data[3].2")
+        unused = _match_result(
+            plc_name="TSV246_EV", dev_tag="TSV246", plc_address="Rack26:12:O.Data.8",
+        )
+        enrich_results([confirmed, unused], enrichment, audit=False)
+
+        assert Source.L5X in confirmed.sources
+        assert confirmed.plc_tag.description == "Tank 601 Valve"
+        assert unused.classification == Classification.RACK_ONLY
+        assert AuditCode.TAG_CONFIRMED in confirmed.audit_codes
+        assert AuditCode.MAY_BE_UNUSED in unused.audit_codes
+        assert confirmed.audit_trail == []
+        assert unused.audit_trail == []
 
 
 # ===========================================================================
@@ -428,7 +452,7 @@ class TestRungCdataAddressFoundInCdata:
         )
         enrich_results([result], enrichment)
 
-        assert any("rung CDATA references" in s for s in result.audit_trail)
+        assert AuditCode.CDATA_REFERENCED in result.audit_codes
         assert result.classification == Classification.BOTH
 
     def test_clx_address_found_in_cdata(self):
@@ -445,7 +469,24 @@ class TestRungCdataAddressFoundInCdata:
         )
         enrich_results([result], enrichment)
 
-        assert any("rung CDATA references" in s for s in result.audit_trail)
+        assert AuditCode.CDATA_REFERENCED in result.audit_codes
+        assert result.classification == Classification.BOTH
+
+    def test_address_inside_expression_operand_found(self):
+        """An address used in a CPT/CMP expression still counts as referenced."""
+        data = _make_data(
+            rung_references=["tank_level", "rack26:12:o.data.8*100 + offset"],
+        )
+        enrichment = extract_l5x_enrichment(data)
+
+        result = _match_result(
+            plc_name="TSV246_EV",
+            dev_tag="TSV246",
+            plc_address="Rack26:12:O.Data.8",
+        )
+        enrich_results([result], enrichment)
+
+        assert AuditCode.CDATA_REFERENCED in result.audit_codes
         assert result.classification == Classification.BOTH
 
 
@@ -467,7 +508,7 @@ class TestRungCdataAddressNotInCdata:
 
         assert result.classification == Classification.RACK_ONLY
         assert result.conflict_flag is True
-        assert any("may be unused" in s for s in result.audit_trail)
+        assert AuditCode.MAY_BE_UNUSED in result.audit_codes
 
     def test_clx_address_not_in_cdata(self):
         """CLX rack address not found in CDATA — real-world scenario."""
@@ -485,7 +526,7 @@ class TestRungCdataAddressNotInCdata:
 
         assert result.classification == Classification.RACK_ONLY
         assert result.conflict_flag is True
-        assert any("may be unused" in s for s in result.audit_trail)
+        assert AuditCode.MAY_BE_UNUSED in result.audit_codes
 
     def test_no_rung_refs_available(self):
         """When rung_references is empty, CDATA pass is skipped (no false positives)."""
@@ -571,7 +612,7 @@ class TestSpareCdataConflict:
 
         assert result.classification == Classification.CONFLICT
         assert result.conflict_flag is True
-        assert any("spare but address is referenced in rung CDATA" in s for s in result.audit_trail)
+        assert AuditCode.SPARE_REFERENCED in result.audit_codes
 
     def test_spare_alias_in_cdata_becomes_conflict(self):
         """Alias tag name for spare address found in CDATA -> conflict."""
@@ -593,6 +634,38 @@ class TestSpareCdataConflict:
         assert result.classification == Classification.CONFLICT
         assert result.conflict_flag is True
 
+    def test_mixed_batch_only_referenced_spares_reclassified(self):
+        """In one batch, only spares used in CDATA change; others are untouched."""
+        data = _make_data(
+            alias_tags=[
+                _alias("LT_611", "Rack26:14:I.Ch0Data", "Level Transmitter"),
+            ],
+            rung_references=["rack26:12:o.data.8", "lt_611"],
+        )
+        enrichment = extract_l5x_enrichment(data)
+
+        by_address = _match_result(
+            dev_tag="SPARE", plc_address="Rack26:12:O.Data.8",
+            classification=Classification.SPARE,
+        )
+        by_alias = _match_result(
+            dev_tag="SPARE", plc_address="Rack26:14:I.Ch0Data",
+            classification=Classification.SPARE,
+        )
+        unused = _match_result(
+            dev_tag="SPARE", plc_address="Rack26:12:O.Data.9",
+            classification=Classification.SPARE,
+        )
+        referenced_non_spare = _match_result(
+            plc_name="TSV246_EV", dev_tag="TSV246", plc_address="Rack26:12:O.Data.8",
+        )
+        enrich_results([by_address, unused, by_alias, referenced_non_spare], enrichment)
+
+        assert by_address.classification == Classification.CONFLICT
+        assert by_alias.classification == Classification.CONFLICT
+        assert unused.classification == Classification.SPARE
+        assert referenced_non_spare.classification == Classification.BOTH
+
     def test_spare_not_in_cdata_stays_spare(self):
         """Spare address NOT in CDATA -> stays spare."""
         data = _make_data(
@@ -8,6 +8,7 @@ from io_crosscheck.normalizers import (
     strip_suffixes,
     normalize_address,
     detect_address_format,
+    is_rack_address,
     extract_rack_base,
     extract_enet_device,
     KNOWN_SUFFIXES,
@@ -24,56 +25,27 @@ class TestNormalizeTag:
     def test_lowercase(self):
         assert normalize_tag("TSV22") == "tsv22"
 
-    def test_strips_ev_suffix(self):
-        assert normalize_tag("TSV22_EV") == "tsv22"
-
-    def test_strips_mc_suffix(self):
-        assert normalize_tag("P611_MC") == "p611"
-
-    def test_strips_aux_suffix(self):
-        assert normalize_tag("AS611_AUX") == "as611"
-
-    def test_strips_zso_suffix(self):
-        assert normalize_tag("XV100_ZSO") == "xv100"
-
-    def test_strips_zsc_suffix(self):
-        assert normalize_tag("XV100_ZSC") == "xv100"
-
-    def test_strips_pulse_suffix(self):
-        assert normalize_tag("FT656B_Pulse") == "ft656b"
-
-    def test_strips_in_suffix(self):
-        assert normalize_tag("SOL1_In") == "sol1"
-
-    def test_strips_input_suffix(self):
-        assert normalize_tag("SOL1_Input") == "sol1"
-
-    def test_strips_out_suffix(self):
-        assert normalize_tag("SOL1_Out") == "sol1"
-
-    def test_strips_old_suffix(self):
-        assert normalize_tag("P100_Old") == "p100"
-
-    def test_strips_pos_suffix(self):
-        assert normalize_tag("XV200_Pos") == "xv200"
-
-    def test_strips_failedtoclose_suffix(self):
-        assert normalize_tag("XV200_FailedToClose") == "xv200"
-
-    def test_strips_failedtoopen_suffix(self):
-        assert normalize_tag("XV200_FailedToOpen") == "xv200"
-
-    def test_strips_ontimer_suffix(self):
-        assert normalize_tag("P100_OnTimer") == "p100"
-
-    def test_strips_offtimer_suffix(self):
-        assert normalize_tag("P100_OffTimer") == "p100"
-
-    def test_strips_monitor_suffix(self):
-        assert normalize_tag("LT6110_Monitor") == "lt6110"
-
-    def test_strips_failed_suffix(self):
-        assert normalize_tag("P100_Failed") == "p100"
+    @pytest.mark.parametrize("raw, expected", [
+        ("TSV22_EV", "tsv22"),
+        ("P611_MC", "p611"),
+        ("AS611_AUX", "as611"),
+        ("XV100_ZSO", "xv100"),
+        ("XV100_ZSC", "xv100"),
+        ("FT656B_Pulse", "ft656b"),
+        ("SOL1_In", "sol1"),
+        ("SOL1_Input", "sol1"),
+        ("SOL1_Out", "sol1"),
+        ("P100_Old", "p100"),
+        ("XV200_Pos", "xv200"),
+        ("XV200_FailedToClose", "xv200"),
+        ("XV200_FailedToOpen", "xv200"),
+        ("P100_OnTimer", "p100"),
+        ("P100_OffTimer", "p100"),
+        ("LT6110_Monitor", "lt6110"),
+        ("P100_Failed", "p100"),
+    ])
+    def test_strips_known_suffix(self, raw, expected):
+        assert normalize_tag(raw) == expected
 
     def test_trims_whitespace(self):
         assert normalize_tag("  TSV22_EV  ") == "tsv22"
@@ -154,34 +126,40 @@ class TestNormalizeAddress:
 
 class TestDetectAddressFormat:
 
-    def test_clx_format(self):
-        assert detect_address_format("Rack11:I.Data[3].13") == "CLX"
-
-    def test_clx_output_format(self):
-        assert detect_address_format("Rack0:O.DATA[2].5") == "CLX"
-
-    def test_plc5_format(self):
-        assert detect_address_format("Rack0_Group0_Slot0_IO.READ[4]") == "PLC5"
-
-    def test_plc5_write_format(self):
-        assert detect_address_format("Rack1_Group1_Slot2_IO.WRITE[0]") == "PLC5"
-
-    def test_unknown_format(self):
-        assert detect_address_format("SomeRandomTag") == "Unknown"
+    @pytest.mark.parametrize("address, expected", [
+        ("Rack11:I.Data[3].13", "CLX"),
+        ("Rack0:O.DATA[2].5", "CLX"),
+        # Slot-specific and analog-channel CLX forms
+        ("Rack25:8:I.Data.4", "CLX"),
+        ("Rack24:14:I.Ch2Data", "CLX"),
+        ("Rack25:10:O.Data.11", "CLX"),
+        ("Rack0_Group0_Slot0_IO.READ[4]", "PLC5"),
+        ("Rack1_Group1_Slot2_IO.WRITE[0]", "PLC5"),
+        ("SomeRandomTag", "Unknown"),
+    ])
+    def test_format(self, address, expected):
+        assert detect_address_format(address) == expected
 
     def test_empty_string(self):
         assert detect_address_format("") == "Unknown"
 
-    def test_clx_slot_specific(self):
-        """Slot-specific CLX address like Rack25:8:I.Data.4."""
-        assert detect_address_format("Rack25:8:I.Data.4") == "CLX"
 
-    def test_clx_analog_channel(self):
-        """Analog channel CLX address like Rack24:14:I.Ch2Data."""
-        assert detect_address_format("Rack24:14:I.Ch2Data") == "CLX"
-
-    def test_clx_slot_specific_output(self):
-        assert detect_address_format("Rack25:10:O.Data.11") == "CLX"
+@pytest.mark.parametrize("address", [
+    "Rack11:I.Data[3].13",
+    "Rack0:O.DATA[2].5",
+    "Rack0_Group0_Slot0_IO.READ[4]",
+    "Rack1_Group1_Slot2_IO.WRITE[0]",
+    "Rack25:8:I.Data.4",
+    "Rack24:14:I.Ch2Data",
+    "Rack25:10:O.Data.11",
+    "SomeRandomTag",
+    "",
+    "  Rack0:I.Data[5].7",
+    "N166_R[0]",
+    "Rack0_Group0_Slot0_IO",
+])
+def test_is_rack_address_agrees_with_detect_address_format(address):
+    assert is_rack_address(address) is (detect_address_format(address) in ("CLX", "PLC5"))
 
 
 # ---------------------------------------------------------------------------
@@ -190,34 +168,29 @@ class TestDetectAddressFormat:
 
 class TestExtractRackBase:
 
-    def test_clx_input(self):
-        assert extract_rack_base("Rack11:I.DATA[3].13") == "Rack11:I"
-
-    def test_clx_output(self):
-        assert extract_rack_base("Rack0:O.DATA[2].5") == "Rack0:O"
+    @pytest.mark.parametrize("address, expected", [
+        ("Rack11:I.DATA[3].13", "Rack11:I"),
+        ("Rack0:O.DATA[2].5", "Rack0:O"),
+        # Slot-specific and analog-channel CLX forms return the rack name
+        ("Rack25:8:I.Data.4", "Rack25"),
+        ("Rack24:14:I.Ch2Data", "Rack24"),
+    ])
+    def test_rack_base(self, address, expected):
+        assert extract_rack_base(address) == expected
 
     def test_case_insensitive_result(self):
         result = extract_rack_base("Rack0:I.Data[5].0")
         assert result is not None
         assert result.lower() == "rack0:i"
 
-    def test_non_rack_address_returns_none(self):
-        assert extract_rack_base("E300_P621:I") is None
-
-    def test_empty_returns_none(self):
-        assert extract_rack_base("") is None
-
-    def test_plc5_returns_none(self):
-        """PLC5 addresses don't have a CLX rack base."""
-        assert extract_rack_base("Rack0_Group0_Slot0_IO.READ[4]") is None
-
-    def test_slot_specific_returns_rack_name(self):
-        """Slot-specific CLX: Rack25:8:I.Data.4 -> Rack25."""
-        assert extract_rack_base("Rack25:8:I.Data.4") == "Rack25"
-
-    def test_analog_channel_returns_rack_name(self):
-        """Analog channel CLX: Rack24:14:I.Ch2Data -> Rack24."""
-        assert extract_rack_base("Rack24:14:I.Ch2Data") == "Rack24"
+    @pytest.mark.parametrize("address", [
+        "E300_P621:I",
+        "",
+        # PLC5 addresses don't have a CLX rack base
+        "Rack0_Group0_Slot0_IO.READ[4]",
+    ])
+    def test_returns_none(self, address):
+        assert extract_rack_base(address) is None
 
 
 # ---------------------------------------------------------------------------
@@ -226,31 +199,18 @@ class TestExtractRackBase:
 
 class TestExtractEnetDevice:
 
-    def test_e300_prefix(self):
-        assert extract_enet_device("E300_P621:I") == "P621"
-
-    def test_vfd_prefix(self):
-        assert extract_enet_device("VFD_M101:O") == "M101"
-
-    def test_ipdev_prefix(self):
-        assert extract_enet_device("IPDev_FT601:I") == "FT601"
-
-    def test_ipdev_uppercase(self):
-        assert extract_enet_device("IPDEV_FT601:I") == "FT601"
-
-    def test_no_io_suffix(self):
-        """Handle tags without :I or :O suffix."""
-        result = extract_enet_device("E300_P621")
-        assert result == "P621"
-
-    def test_non_enet_returns_none(self):
-        assert extract_enet_device("Rack0:I") is None
-
-    def test_empty_returns_none(self):
-        assert extract_enet_device("") is None
-
-    def test_regular_tag_returns_none(self):
-        assert extract_enet_device("MyCounter") is None
-
-    def test_case_insensitive_prefix(self):
-        assert extract_enet_device("e300_P621:I") == "P621"
+    @pytest.mark.parametrize("tag, expected", [
+        ("E300_P621:I", "P621"),
+        ("VFD_M101:O", "M101"),
+        ("IPDev_FT601:I", "FT601"),
+        ("IPDEV_FT601:I", "FT601"),
+        ("e300_P621:I", "P621"),
+        # Tags without an :I or :O suffix
+        ("E300_P621", "P621"),
+    ])
+    def test_device(self, tag, expected):
+        assert extract_enet_device(tag) == expected
+
+    @pytest.mark.parametrize("tag", ["Rack0:I", "", "MyCounter"])
+    def test_non_enet_returns_none(self, tag):
+        assert extract_enet_device(tag) is None
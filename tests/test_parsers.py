@@ -2,13 +2,27 @@
 from __future__ import annotations
 
 import csv
-import tempfile
+import io
+from datetime import date, datetime
 from pathlib import Path
 
+import openpyxl
 import pytest
 
 from io_crosscheck.models import PLCTag, IODevice, RecordType, AddressFormat
-from io_crosscheck.parsers import parse_plc_csv, parse_io_list_xlsx
+from io_crosscheck.parsers import (
+    parse_plc_csv, parse_plc_csv_rows, parse_io_list_rows, parse_io_list_xlsx,
+)
+
+_CSV_HEADER = [
+    "TYPE", "SCOPE", "NAME", "DESCRIPTION", "DATATYPE", "SPECIFIER", "ATTRIBUTES",
+]
+
+_IO_HEADER = (
+    "Panel", "Rack", "Group", "Slot", "Channel",
+    "PLC IO Address", "IO Tag", "Device Tag",
+    "Module Type", "Module", "Range Low", "Range High", "Units",
+)
 
 
 # ---------------------------------------------------------------------------
@@ -18,228 +32,296 @@ from io_crosscheck.parsers import parse_plc_csv, parse_io_list_xlsx
 class TestParsePLCCSV:
     """Tests for RSLogix 5000 CSV tag export parsing."""
 
-    def _write_csv(self, lines: list[str], encoding: str = "utf-8") -> Path:
-        """Helper to write CSV lines to a temp file."""
-        tmp = tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False, encoding=encoding, newline=""
-        )
-        for line in lines:
-            tmp.write(line + "\n")
-        tmp.close()
-        return Path(tmp.name)
+    def _csv(self, lines: list[str]) -> io.StringIO:
+        """Helper to wrap CSV lines in an in-memory text file."""
+        return io.StringIO("\n".join(lines) + "\n")
+
+    def _write_csv(
+        self, tmp_path: Path, lines: list[str], encoding: str = "utf-8",
+    ) -> Path:
+        """Helper to write CSV lines to a file under pytest's tmp_path."""
+        path = tmp_path / "tags.csv"
+        path.write_text("\n".join(lines) + "\n", encoding=encoding, newline="")
+        return path
 
     def test_parse_tag_record(self):
-        lines = [
-            'TYPE,SCOPE,NAME,DESCRIPTION,DATATYPE,SPECIFIER,ATTRIBUTES',
-            'TAG,,Rack0:I,,AB:1756_IF8:I:0,,',
+        rows = [
+            _CSV_HEADER,
+            ["TAG", "", "Rack0:I", "", "AB:1756_IF8:I:0", "", ""],
         ]
-        path = self._write_csv(lines)
-        tags = parse_plc_csv(path, encoding="utf-8")
+        tags = parse_plc_csv_rows(rows)
         assert len(tags) >= 1
-        tag = [t for t in tags if t.name == "Rack0:I"][0]
+        tag = tags.by_name["Rack0:I"]
         assert tag.record_type == RecordType.TAG
         assert tag.datatype == "AB:1756_IF8:I:0"
 
     def test_parse_comment_record(self):
-        lines = [
-            'TYPE,SCOPE,NAME,DESCRIPTION,DATATYPE,SPECIFIER,ATTRIBUTES',
-            'COMMENT,,Rack0:I,HLSTL5A,,Rack0:I.DATA[5].7,',
+        rows = [
+            _CSV_HEADER,
+            ["COMMENT", "", "Rack0:I", "HLSTL5A", "", "Rack0:I.DATA[5].7", ""],
         ]
-        path = self._write_csv(lines)
-        tags = parse_plc_csv(path, encoding="utf-8")
+        tags = parse_plc_csv_rows(rows)
         comments = [t for t in tags if t.record_type == RecordType.COMMENT]
         assert len(comments) >= 1
         assert comments[0].description == "HLSTL5A"
         assert comments[0].specifier == "Rack0:I.DATA[5].7"
 
     def test_parse_alias_record(self):
-        lines = [
-            'TYPE,SCOPE,NAME,DESCRIPTION,DATATYPE,SPECIFIER,ATTRIBUTES',
-            'ALIAS,,Local:1:I.Data.0,,,Rack25:1:I.Data.0,',
+        rows = [
+            _CSV_HEADER,
+            ["ALIAS", "", "Local:1:I.Data.0", "", "", "Rack25:1:I.Data.0", ""],
         ]
-        path = self._write_csv(lines)
-        tags = parse_plc_csv(path, encoding="utf-8")
+        tags = parse_plc_csv_rows(rows)
         aliases = [t for t in tags if t.record_type == RecordType.ALIAS]
         assert len(aliases) >= 1
 
     def test_base_name_extraction(self):
         """Base name should strip :I, :O, :C, :S suffixes."""
-        lines = [
-            'TYPE,SCOPE,NAME,DESCRIPTION,DATATYPE,SPECIFIER,ATTRIBUTES',
-            'TAG,,E300_P621:I,,AB:E300_OL:I:0,,',
+        rows = [
+            _CSV_HEADER,
+            ["TAG", "", "E300_P621:I", "", "AB:E300_OL:I:0", "", ""],
         ]
-        path = self._write_csv(lines)
-        tags = parse_plc_csv(path, encoding="utf-8")
-        tag = [t for t in tags if t.name == "E300_P621:I"][0]
+        tags = parse_plc_csv_rows(rows)
+        tag = tags.by_name["E300_P621:I"]
         assert tag.base_name == "E300_P621"
 
     def test_base_name_no_suffix(self):
-        lines = [
-            'TYPE,SCOPE,NAME,DESCRIPTION,DATATYPE,SPECIFIER,ATTRIBUTES',
-            'TAG,,MyCounter,,DINT,,',
+        rows = [
+            _CSV_HEADER,
+            ["TAG", "", "MyCounter", "", "DINT", "", ""],
         ]
-        path = self._write_csv(lines)
-        tags = parse_plc_csv(path, encoding="utf-8")
-        tag = [t for t in tags if t.name == "MyCounter"][0]
+        tags = parse_plc_csv_rows(rows)
+        tag = tags.by_name["MyCounter"]
         assert tag.base_name == "MyCounter"
 
     def test_scoped_tag(self):
-        lines = [
-            'TYPE,SCOPE,NAME,DESCRIPTION,DATATYPE,SPECIFIER,ATTRIBUTES',
-            'TAG,MainProgram,LocalVar,,DINT,,',
+        rows = [
+            _CSV_HEADER,
+            ["TAG", "MainProgram", "LocalVar", "", "DINT", "", ""],
         ]
-        path = self._write_csv(lines)
-        tags = parse_plc_csv(path, encoding="utf-8")
-        tag = [t for t in tags if t.name == "LocalVar"][0]
+        tags = parse_plc_csv_rows(rows)
+        tag = tags.by_name["LocalVar"]
         assert tag.scope == "MainProgram"
 
     def test_source_line_tracking(self):
-        lines = [
-            'TYPE,SCOPE,NAME,DESCRIPTION,DATATYPE,SPECIFIER,ATTRIBUTES',
-            'TAG,,Rack0:I,,AB:1756_IF8:I:0,,',
-            'TAG,,Rack11:I,,AB:1756_IF8:I:0,,',
+        rows = [
+            _CSV_HEADER,
+            ["TAG", "", "Rack0:I", "", "AB:1756_IF8:I:0", "", ""],
+            ["TAG", "", "Rack11:I", "", "AB:1756_IF8:I:0", "", ""],
         ]
-        path = self._write_csv(lines)
-        tags = parse_plc_csv(path, encoding="utf-8")
+        tags = parse_plc_csv_rows(rows)
         # Source lines should be tracked (1-indexed, skipping header)
         assert all(t.source_line > 0 for t in tags)
 
     def test_empty_file(self):
-        lines = [
-            'TYPE,SCOPE,NAME,DESCRIPTION,DATATYPE,SPECIFIER,ATTRIBUTES',
+        rows = [
+            _CSV_HEADER,
         ]
-        path = self._write_csv(lines)
-        tags = parse_plc_csv(path, encoding="utf-8")
+        tags = parse_plc_csv_rows(rows)
         assert tags == []
 
-    def test_latin1_encoding(self):
+    def test_latin1_encoding(self, tmp_path):
         """CHRL tag export uses Latin-1 with degree symbols."""
         lines = [
             'TYPE,SCOPE,NAME,DESCRIPTION,DATATYPE,SPECIFIER,ATTRIBUTES',
             'TAG,,TempSensor,Temperature \xb0F,REAL,,',
         ]
-        path = self._write_csv(lines, encoding="latin-1")
+        path = self._write_csv(tmp_path, lines, encoding="latin-1")
         tags = parse_plc_csv(path, encoding="latin-1")
         assert len(tags) >= 1
         assert "°" in tags[0].description or "\xb0" in tags[0].description
 
     def test_rcomment_record_skipped_or_parsed(self):
         """RCOMMENT records should be handled (parsed or skipped gracefully)."""
-        lines = [
-            'TYPE,SCOPE,NAME,DESCRIPTION,DATATYPE,SPECIFIER,ATTRIBUTES',
-            'RCOMMENT,MainProgram,0,"This is a rung comment",,,',
+        rows = [
+            _CSV_HEADER,
+            ["RCOMMENT", "MainProgram", "0", "This is a rung comment", "", "", ""],
         ]
-        path = self._write_csv(lines)
         # Should not raise
-        tags = parse_plc_csv(path, encoding="utf-8")
+        tags = parse_plc_csv_rows(rows)
         # RCOMMENT may or may not be in results, but should not crash
 
+    def test_by_name_keeps_first_record(self):
+        rows = [
+            _CSV_HEADER,
+            ["TAG", "", "Rack0:I", "", "AB:1756_IF8:I:0", "", ""],
+            ["COMMENT", "", "Rack0:I", "HLSTL5A", "", "Rack0:I.DATA[5].7", ""],
+        ]
+        tags = parse_plc_csv_rows(rows)
+        assert tags.by_name["Rack0:I"] is tags[0]
+        assert set(tags.by_name) == {"Rack0:I"}
+
+    def test_repeated_names_share_one_string(self):
+        rows = [
+            _CSV_HEADER,
+            ["COMMENT", "", "Rack0:I", "HLSTL5A", "", "Rack0:I.DATA[5].7", ""],
+            ["COMMENT", "", "Rack0:I", "HLSTL5C", "", "Rack0:I.DATA[5].6", ""],
+        ]
+        first, second = parse_plc_csv_rows(rows)
+        assert first.name is second.name
+        assert first.base_name is second.base_name
+
+    def test_text_file_object(self):
+        lines = [
+            'TYPE,SCOPE,NAME,DESCRIPTION,DATATYPE,SPECIFIER,ATTRIBUTES',
+            'COMMENT,,Rack0:I,"HLSTL5A, high level",,Rack0:I.DATA[5].7,',
+        ]
+        tags = parse_plc_csv(self._csv(lines))
+        assert [(t.description, t.source_line) for t in tags] == [
+            ("HLSTL5A, high level", 2),
+        ]
+
 
 # ---------------------------------------------------------------------------
 # IO List XLSX Parser Tests (using synthetic data)
 # ---------------------------------------------------------------------------
 
-class TestParseIOListXLSX:
-    """Tests for IO List XLSX parsing.
-
-    These tests create minimal XLSX files with openpyxl to test parsing logic.
-    """
-
-    def _create_xlsx(self, rows: list[list], sheet_name: str = "ESCO List") -> Path:
-        """Create a minimal XLSX file with given rows."""
-        import openpyxl
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = sheet_name
-        for row in rows:
-            ws.append(row)
-        tmp = tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False)
-        tmp.close()
-        wb.save(tmp.name)
-        return Path(tmp.name)
-
-    def test_parse_basic_row(self):
-        header = ["Panel", "Rack", "Group", "Slot", "Channel",
-                  "PLC IO Address", "IO Tag", "Device Tag",
-                  "Module Type", "Module", "Range Low", "Range High", "Units"]
-        data = ["X3", "11", "", "3", "13",
-                "Rack11:I.Data[3].13", "LT611", "LT611",
-                "AI", "1756-IF8", "4", "20", "mA"]
-        path = self._create_xlsx([header, data])
-        devices = parse_io_list_xlsx(path)
-        assert len(devices) == 1
-        d = devices[0]
-        assert d.panel == "X3"
-        assert d.rack == "11"
-        assert d.slot == "3"
-        assert d.channel == "13"
-        assert d.plc_address == "Rack11:I.Data[3].13"
-        assert d.io_tag == "LT611"
-        assert d.device_tag == "LT611"
-        assert d.module_type == "AI"
+class TestParseIOListRows:
+    """Tests for the IO List row parser shared by every workbook engine."""
 
     def test_address_format_detection_clx(self):
-        header = ["Panel", "Rack", "Group", "Slot", "Channel",
-                  "PLC IO Address", "IO Tag", "Device Tag",
-                  "Module Type", "Module", "Range Low", "Range High", "Units"]
         data = ["X3", "11", "", "3", "13",
                 "Rack11:I.Data[3].13", "LT611", "LT611",
                 "AI", "", "", "", ""]
-        path = self._create_xlsx([header, data])
-        devices = parse_io_list_xlsx(path)
+        devices = parse_io_list_rows([_IO_HEADER, data])
         assert devices[0].address_format == AddressFormat.CLX
 
     def test_address_format_detection_plc5(self):
-        header = ["Panel", "Rack", "Group", "Slot", "Channel",
-                  "PLC IO Address", "IO Tag", "Device Tag",
-                  "Module Type", "Module", "Range Low", "Range High", "Units"]
         data = ["X1", "0", "0", "0", "4",
                 "Rack0_Group0_Slot0_IO.READ[4]", "TSV22_EV", "TSV22",
                 "DO", "", "", "", ""]
-        path = self._create_xlsx([header, data])
-        devices = parse_io_list_xlsx(path)
+        devices = parse_io_list_rows([_IO_HEADER, data])
         assert devices[0].address_format == AddressFormat.PLC5
 
     def test_spare_point_parsed(self):
-        header = ["Panel", "Rack", "Group", "Slot", "Channel",
-                  "PLC IO Address", "IO Tag", "Device Tag",
-                  "Module Type", "Module", "Range Low", "Range High", "Units"]
         data = ["X1", "0", "0", "0", "14",
                 "Rack0_Group0_Slot0_IO.READ[14]", "Spare", "",
                 "DI", "", "", "", ""]
-        path = self._create_xlsx([header, data])
-        devices = parse_io_list_xlsx(path)
+        devices = parse_io_list_rows([_IO_HEADER, data])
         assert len(devices) == 1
         assert devices[0].io_tag == "Spare"
 
     def test_source_row_tracking(self):
-        header = ["Panel", "Rack", "Group", "Slot", "Channel",
-                  "PLC IO Address", "IO Tag", "Device Tag",
-                  "Module Type", "Module", "Range Low", "Range High", "Units"]
         data1 = ["X1", "0", "", "0", "0", "Rack0:I.Data[0].0", "D1", "D1", "DI", "", "", "", ""]
         data2 = ["X1", "0", "", "0", "1", "Rack0:I.Data[0].1", "D2", "D2", "DI", "", "", "", ""]
-        path = self._create_xlsx([header, data1, data2])
-        devices = parse_io_list_xlsx(path)
+        devices = parse_io_list_rows([_IO_HEADER, data1, data2])
         assert len(devices) == 2
         assert devices[0].source_row != devices[1].source_row
 
     def test_empty_sheet(self):
-        header = ["Panel", "Rack", "Group", "Slot", "Channel",
-                  "PLC IO Address", "IO Tag", "Device Tag",
-                  "Module Type", "Module", "Range Low", "Range High", "Units"]
-        path = self._create_xlsx([header])
-        devices = parse_io_list_xlsx(path)
+        devices = parse_io_list_rows([_IO_HEADER])
         assert devices == []
 
     def test_multiple_panels(self):
-        header = ["Panel", "Rack", "Group", "Slot", "Channel",
-                  "PLC IO Address", "IO Tag", "Device Tag",
-                  "Module Type", "Module", "Range Low", "Range High", "Units"]
-        rows = [header]
+        rows = [_IO_HEADER]
         for panel in ["X1", "X2", "X3"]:
             rows.append([panel, "0", "", "0", "0", "Rack0:I.Data[0].0",
                         f"D_{panel}", f"D_{panel}", "DI", "", "", "", ""])
-        path = self._create_xlsx(rows)
-        devices = parse_io_list_xlsx(path)
+        devices = parse_io_list_rows(rows)
         panels = {d.panel for d in devices}
         assert panels == {"X1", "X2", "X3"}
+
+    def test_rows_before_header_keep_sheet_numbering(self):
+        title = ["IO List", None, None]
+        blank = [None, None, None]
+        data = ["X1", "0", "", "0", "0", "Rack0:I.Data[0].0", "D1", "D1", "DI", "", "", "", ""]
+        devices = parse_io_list_rows([title, _IO_HEADER, blank, data])
+        assert [d.source_row for d in devices] == [4]
+
+
+@pytest.mark.slow
+class TestParseIOListXLSX:
+    """Tests for IO List XLSX parsing.
+
+    These tests build minimal in-memory workbooks with the ``xlsx_factory``
+    fixture and hand them straight to the parser.  Row handling is covered by
+    ``TestParseIOListRows``; only the tests marked ``io`` touch the disk.
+    """
+
+    def test_parse_basic_row(self, xlsx_factory):
+        data = ["X3", "11", "", "3", "13",
+                "Rack11:I.Data[3].13", "LT611", "LT611",
+                "AI", "1756-IF8", "4", "20", "mA"]
+        wb = xlsx_factory([_IO_HEADER, data])
+        devices = parse_io_list_xlsx(wb)
+        assert len(devices) == 1
+        d = devices[0]
+        assert d.panel == "X3"
+        assert d.rack == "11"
+        assert d.slot == "3"
+        assert d.channel == "13"
+        assert d.plc_address == "Rack11:I.Data[3].13"
+        assert d.io_tag == "LT611"
+        assert d.device_tag == "LT611"
+        assert d.module_type == "AI"
+
+    @pytest.mark.io
+    def test_workbook_opened_read_only(self, xlsx_factory, monkeypatch, tmp_path):
+        """The parser must stream the sheet rather than load the full DOM."""
+        path = tmp_path / "io.xlsx"
+        xlsx_factory([_IO_HEADER]).save(path)
+
+        calls = []
+        real_load_workbook = openpyxl.load_workbook
+
+        def spy(*args, **kwargs):
+            calls.append(kwargs)
+            return real_load_workbook(*args, **kwargs)
+
+        monkeypatch.setattr(openpyxl, "load_workbook", spy)
+        parse_io_list_xlsx(path, engine="openpyxl")
+        assert calls == [{"read_only": True, "data_only": True}]
+
+    def test_unknown_engine_rejected(self, xlsx_factory):
+        wb = xlsx_factory([_IO_HEADER])
+        with pytest.raises(ValueError, match="Unknown XLSX engine"):
+            parse_io_list_xlsx(wb, engine="xlrd")
+
+    def test_missing_sheet_in_workbook(self, xlsx_factory):
+        wb = xlsx_factory([], sheet_name="Other")
+        with pytest.raises(KeyError):
+            parse_io_list_xlsx(wb)
+
+    @pytest.mark.io
+    @pytest.mark.parametrize("engine", ["openpyxl", "calamine"])
+    def test_path_file_object_and_workbook_agree(self, xlsx_factory, tmp_path, engine):
+        if engine == "calamine":
+            pytest.importorskip("python_calamine")
+        data = ["X3", "11", "", "3", "13",
+                "Rack11:I.Data[3].13", "LT611", "LT611",
+                "AI", "1756-IF8", "4", "20", "mA"]
+        wb = xlsx_factory([_IO_HEADER, data])
+        path = tmp_path / "io.xlsx"
+        wb.save(path)
+
+        from_workbook = parse_io_list_xlsx(wb)
+        from_path = parse_io_list_xlsx(path, engine=engine)
+        with path.open("rb") as fh:
+            from_file = parse_io_list_xlsx(fh, engine=engine)
+        assert from_path == from_workbook
+        assert from_file == from_workbook
+
+    @pytest.mark.io
+    def test_calamine_cell_values_match_openpyxl(self, xlsx_factory, tmp_path):
+        """Numbers, dates and large floats must stringify the same way."""
+        pytest.importorskip("python_calamine")
+        data = ["X3", 11, 0, 3.0, -0.0,
+                "Rack11:I.Data[3].13", "LT611", "LT611",
+                datetime(2024, 1, 2), date(2024, 1, 3), 20.5, 1e16, 1e15]
+        path = tmp_path / "io.xlsx"
+        xlsx_factory([_IO_HEADER, data]).save(path)
+
+        expected = parse_io_list_xlsx(path, engine="openpyxl")
+        assert parse_io_list_xlsx(path, engine="calamine") == expected
+        d = expected[0]
+        assert (d.rack, d.slot, d.channel) == ("11", "3", "0")
+        assert d.module_type == "2024-01-02 00:00:00"
+        assert d.module == "2024-01-03 00:00:00"
+        assert (d.range_low, d.range_high, d.units) == ("20.5", "1e+16", "1000000000000000")
+
+
+@pytest.mark.parametrize("engine", [None, "openpyxl", "calamine"])
+def test_unmarked_tests_cannot_load_workbooks(io_xlsx, engine):
+    """The conftest guard refuses workbook loads under every engine."""
+    with pytest.raises(RuntimeError, match="mark it @pytest.mark.io"):
+        parse_io_list_xlsx(io_xlsx, engine=engine)
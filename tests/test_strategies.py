@@ -16,6 +16,28 @@ from io_crosscheck.strategies import (
 )
 
 
+# PLC tags shared by several tests.  Strategies only read tags, so one
+# instance of each is built per module.
+_COMMENT_RACK0_HLSTL5A_5_7 = PLCTag(
+    record_type=RecordType.COMMENT,
+    name="Rack0:I",
+    description="HLSTL5A",
+    specifier="Rack0:I.DATA[5].7",
+    category=TagCategory.BIT_LEVEL_COMMENT,
+)
+_TAG_PLC5_RACK0_GROUP0_SLOT0 = PLCTag(
+    record_type=RecordType.TAG,
+    name="Rack0_Group0_Slot0_IO",
+    base_name="Rack0_Group0_Slot0_IO",
+)
+_TAG_E300_P621 = PLCTag(
+    record_type=RecordType.TAG,
+    name="E300_P621:I",
+    base_name="E300_P621",
+    category=TagCategory.ENET_DEVICE,
+)
+
+
 # ===================================================================
 # Strategy 1: Direct CLX Address Match
 # ===================================================================
@@ -23,8 +45,9 @@ from io_crosscheck.strategies import (
 class TestDirectCLXAddressMatch:
     """Strategy 1 — match IO List PLC address against PLC COMMENT specifiers."""
 
-    @pytest.fixture
-    def strategy(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def strategy(cls):
         return DirectCLXAddressMatch()
 
     def test_exact_match_case_insensitive(self, strategy):
@@ -36,15 +59,7 @@ class TestDirectCLXAddressMatch:
             address_format=AddressFormat.CLX,
             source_row=1,
         )
-        plc_tags = [
-            PLCTag(
-                record_type=RecordType.COMMENT,
-                name="Rack0:I",
-                description="HLSTL5A",
-                specifier="Rack0:I.DATA[5].7",
-                category=TagCategory.BIT_LEVEL_COMMENT,
-            ),
-        ]
+        plc_tags = [_COMMENT_RACK0_HLSTL5A_5_7]
         result = strategy.match(io_dev, plc_tags)
         assert result is not None
         assert result.classification == Classification.BOTH
@@ -58,15 +73,7 @@ class TestDirectCLXAddressMatch:
             device_tag="LT611",
             address_format=AddressFormat.CLX,
         )
-        plc_tags = [
-            PLCTag(
-                record_type=RecordType.COMMENT,
-                name="Rack0:I",
-                description="HLSTL5A",
-                specifier="Rack0:I.DATA[5].7",
-                category=TagCategory.BIT_LEVEL_COMMENT,
-            ),
-        ]
+        plc_tags = [_COMMENT_RACK0_HLSTL5A_5_7]
         result = strategy.match(io_dev, plc_tags)
         assert result is None
 
@@ -145,8 +152,9 @@ class TestDirectCLXAddressMatch:
 class TestPLC5RackAddressMatch:
     """Strategy 2 — match PLC5-format IO addresses against PLC TAG names."""
 
-    @pytest.fixture
-    def strategy(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def strategy(cls):
         return PLC5RackAddressMatch()
 
     def test_exact_plc5_match(self, strategy):
@@ -176,13 +184,7 @@ class TestPLC5RackAddressMatch:
             plc_address="rack0_group0_slot0_io.read[4]",
             address_format=AddressFormat.PLC5,
         )
-        plc_tags = [
-            PLCTag(
-                record_type=RecordType.TAG,
-                name="Rack0_Group0_Slot0_IO",
-                base_name="Rack0_Group0_Slot0_IO",
-            ),
-        ]
+        plc_tags = [_TAG_PLC5_RACK0_GROUP0_SLOT0]
         result = strategy.match(io_dev, plc_tags)
         assert result is not None
 
@@ -191,13 +193,7 @@ class TestPLC5RackAddressMatch:
             plc_address="Rack1_Group1_Slot2_IO.WRITE[0]",
             address_format=AddressFormat.PLC5,
         )
-        plc_tags = [
-            PLCTag(
-                record_type=RecordType.TAG,
-                name="Rack0_Group0_Slot0_IO",
-                base_name="Rack0_Group0_Slot0_IO",
-            ),
-        ]
+        plc_tags = [_TAG_PLC5_RACK0_GROUP0_SLOT0]
         result = strategy.match(io_dev, plc_tags)
         assert result is None
 
@@ -235,8 +231,9 @@ class TestPLC5RackAddressMatch:
 class TestENetModuleTagExtraction:
     """Strategy 4 — extract device from E300_/VFD_/IPDev_/IPDEV_ tags."""
 
-    @pytest.fixture
-    def strategy(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def strategy(cls):
         return ENetModuleTagExtraction()
 
     def test_e300_match(self, strategy):
@@ -245,14 +242,7 @@ class TestENetModuleTagExtraction:
             io_tag="P621",
             device_tag="P621",
         )
-        plc_tags = [
-            PLCTag(
-                record_type=RecordType.TAG,
-                name="E300_P621:I",
-                base_name="E300_P621",
-                category=TagCategory.ENET_DEVICE,
-            ),
-        ]
+        plc_tags = [_TAG_E300_P621]
         result = strategy.match(io_dev, plc_tags)
         assert result is not None
         assert result.classification == Classification.BOTH
@@ -288,27 +278,13 @@ class TestENetModuleTagExtraction:
 
     def test_no_match_different_device(self, strategy):
         io_dev = IODevice(device_tag="P622")
-        plc_tags = [
-            PLCTag(
-                record_type=RecordType.TAG,
-                name="E300_P621:I",
-                base_name="E300_P621",
-                category=TagCategory.ENET_DEVICE,
-            ),
-        ]
+        plc_tags = [_TAG_E300_P621]
         result = strategy.match(io_dev, plc_tags)
         assert result is None
 
     def test_case_insensitive_device_match(self, strategy):
         io_dev = IODevice(device_tag="p621")
-        plc_tags = [
-            PLCTag(
-                record_type=RecordType.TAG,
-                name="E300_P621:I",
-                base_name="E300_P621",
-                category=TagCategory.ENET_DEVICE,
-            ),
-        ]
+        plc_tags = [_TAG_E300_P621]
         result = strategy.match(io_dev, plc_tags)
         assert result is not None
 
@@ -346,8 +322,9 @@ class TestENetModuleTagExtraction:
 class TestTagNameNormalizationMatch:
     """Strategy 5 — normalized IO tag/device tag vs PLC tag base names."""
 
-    @pytest.fixture
-    def strategy(self):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def strategy(cls):
         return TagNameNormalizationMatch()
 
     def test_suffix_stripping_match(self, strategy):
@@ -534,13 +511,7 @@ class TestMatchingEngine:
                 address_format=AddressFormat.PLC5,
             ),
         ]
-        plc_tags = [
-            PLCTag(
-                record_type=RecordType.TAG,
-                name="Rack0_Group0_Slot0_IO",
-                base_name="Rack0_Group0_Slot0_IO",
-            ),
-        ]
+        plc_tags = [_TAG_PLC5_RACK0_GROUP0_SLOT0]
         results = engine.run(io_devices, plc_tags)
         assert len(results) == 1
         assert results[0].classification == Classification.SPARE
@@ -556,13 +527,7 @@ class TestMatchingEngine:
             ),
         ]
         plc_tags = [
-            PLCTag(
-                record_type=RecordType.COMMENT,
-                name="Rack0:I",
-                description="HLSTL5A",
-                specifier="Rack0:I.DATA[5].7",
-                category=TagCategory.BIT_LEVEL_COMMENT,
-            ),
+            _COMMENT_RACK0_HLSTL5A_5_7,
             PLCTag(
                 record_type=RecordType.TAG,
                 name="HLSTL5A",
@@ -637,6 +602,116 @@ class TestMatchingEngine:
             assert r1.strategy_id == r2.strategy_id
             assert r1.confidence == r2.confidence
 
+    @pytest.mark.parametrize("method", ["match", "iter_match"])
+    def test_match_requires_prepare(self, engine, method):
+        """Both entry points raise on the call itself, before any iteration."""
+        with pytest.raises(RuntimeError, match="prepare"):
+            getattr(engine, method)([])
+
+    def test_iter_match_streams_match_results(self, engine):
+        io_devices = [
+            IODevice(plc_address="Rack0:I.Data[5].7", io_tag="HLSTL5A",
+                     device_tag="HLSTL5A", address_format=AddressFormat.CLX),
+            IODevice(io_tag="Spare"),
+            IODevice(io_tag="PHANTOM", device_tag="PHANTOM"),
+        ]
+        plc_tags = [
+            _COMMENT_RACK0_HLSTL5A_5_7,
+            PLCTag(record_type=RecordType.TAG, name="E300_P9203:I",
+                   base_name="E300_P9203", source_line=7),
+        ]
+        engine.prepare(plc_tags)
+        seen = []
+
+        def devices():
+            for io_dev in io_devices:
+                seen.append(io_dev)
+                yield io_dev
+
+        stream = engine.iter_match(devices())
+        first = next(stream)
+        assert first.classification == Classification.BOTH
+        assert seen == io_devices[:1]
+
+        rest = list(stream)
+        expected = engine.match(io_devices)
+        assert [first, *rest] == expected
+        assert rest[-1].classification == Classification.PLC_ONLY
+
+    def test_iter_match_keeps_state_across_prepare(self, engine):
+        """Re-preparing the engine must not disturb an open stream."""
+        io_devices = [
+            IODevice(plc_address="Rack0:I.Data[5].7", io_tag="HLSTL5A",
+                     device_tag="HLSTL5A", address_format=AddressFormat.CLX),
+            IODevice(plc_address="Rack0:I.Data[5].7", io_tag="HLSTL5A",
+                     device_tag="HLSTL5A", address_format=AddressFormat.CLX),
+        ]
+        padding = [
+            PLCTag(record_type=RecordType.TAG, name=f"Pad{i}", source_line=i + 1)
+            for i in range(3)
+        ]
+        engine.prepare([*padding, _COMMENT_RACK0_HLSTL5A_5_7])
+        stream = engine.iter_match(io_devices)
+        first = next(stream)
+
+        engine.prepare([])
+        second = next(stream)
+        assert first.plc_tag is _COMMENT_RACK0_HLSTL5A_5_7
+        assert second.plc_tag is _COMMENT_RACK0_HLSTL5A_5_7
+
+    def test_indexed_lookup_keeps_first_comment(self, engine):
+        """Index buckets preserve input order, so the first COMMENT still wins."""
+        io_devices = [
+            IODevice(
+                plc_address="Rack0:I.Data[5].7",
+                io_tag="HLSTL5A",
+                device_tag="HLSTL5A",
+                address_format=AddressFormat.CLX,
+            ),
+        ]
+        plc_tags = [
+            PLCTag(record_type=RecordType.COMMENT, name="Rack0:I",
+                   description="OTHER", specifier="Rack0:I.DATA[5].6", source_line=1),
+            PLCTag(record_type=RecordType.COMMENT, name="Rack0:I",
+                   description="HLSTL5A", specifier="Rack0:I.DATA[5].7", source_line=2),
+            PLCTag(record_type=RecordType.COMMENT, name="Rack0:I",
+                   description="DUPLICATE", specifier="rack0:i.data[5].7", source_line=3),
+        ]
+        engine.prepare(plc_tags)
+        results = engine.match(io_devices)
+        assert results[0].strategy_id == 1
+        assert results[0].plc_tag.source_line == 2
+
+    def test_name_index_keeps_first_tag_and_exact_names(self, engine):
+        """Strategy 5 candidates come from both name keys, in input order."""
+        io_devices = [IODevice(io_tag="LT611", device_tag="LT611")]
+        plc_tags = [
+            PLCTag(record_type=RecordType.TAG, name="LT6110_Monitor",
+                   base_name="LT6110_Monitor", source_line=1),
+            PLCTag(record_type=RecordType.COMMENT, name="Rack0:I",
+                   description="LT611", specifier="Rack0:I.DATA[1].1", source_line=2),
+            PLCTag(record_type=RecordType.TAG, name="LT611",
+                   base_name="LT611", source_line=3),
+        ]
+        results = engine.run(io_devices, plc_tags)
+        assert results[0].strategy_id == 5
+        assert results[0].plc_tag.source_line == 2
+
+    def test_enet_index_ignores_non_enet_tags(self, engine):
+        """Only ENet TAG records are Strategy 4 candidates."""
+        io_devices = [IODevice(io_tag="P621", device_tag="P621")]
+        plc_tags = [
+            PLCTag(record_type=RecordType.COMMENT, name="E300_P621:I",
+                   description="Motor", source_line=1),
+            PLCTag(record_type=RecordType.TAG, name="Pump_P621",
+                   base_name="Pump_P621", source_line=2),
+            PLCTag(record_type=RecordType.TAG, name="e300_p621:O",
+                   base_name="e300_p621", source_line=3),
+        ]
+        results = engine.run(io_devices, plc_tags)
+        assert results[0].strategy_id == 4
+        assert results[0].plc_tag.source_line == 3
+
     def test_audit_trail_populated(self, engine):
         """Every result must have a non-empty audit trail (FR-ACC-04)."""
         io_devices = [